@@ -0,0 +1,124 @@
+"""
+Microbenchmark for the primitive reads and writes of BinaryReader and BinaryWriter.
+
+Compares the precompiled struct fast paths against the previous implementation, which parsed the format string and
+validated its size on every call.
+
+Usage: python -m benchmarks.bench_binary [--number N]
+"""
+
+import argparse
+import struct
+import timeit
+
+from g3blend.io.binary import BinaryReader, BinaryWriter
+from g3blend.io.property_types import bCVector, bCVector2
+from g3blend.io.types import bCQuaternion, bCVector4
+
+
+class _LegacyReader(BinaryReader):
+    def _legacy_unpack(self, fmt: str, num: int):
+        assert num == struct.calcsize(fmt)
+
+        pos = self._pos
+        self._pos += num
+        return struct.unpack_from(fmt, self._buf, pos)
+
+    def read_u8(self) -> int:
+        return self._legacy_unpack('<B', 1)[0]
+
+    def read_u16(self) -> int:
+        return self._legacy_unpack('<H', 2)[0]
+
+    def read_u32(self) -> int:
+        return self._legacy_unpack('<I', 4)[0]
+
+    def read_float(self) -> float:
+        return self._legacy_unpack('<f', 4)[0]
+
+    def read_vec2(self) -> bCVector2:
+        return bCVector2(*self._legacy_unpack('<ff', 8))
+
+    def read_vec3(self) -> bCVector:
+        return bCVector(*self._legacy_unpack('<fff', 12))
+
+    def read_vec4(self) -> bCVector4:
+        return bCVector4(*self._legacy_unpack('<ffff', 16))
+
+    def read_quat(self) -> bCQuaternion:
+        return bCQuaternion(*self._legacy_unpack('<ffff', 16))
+
+
+class _LegacyWriter(BinaryWriter):
+    def _legacy_pack(self, fmt: str, num: int, *args) -> None:
+        assert num == struct.calcsize(fmt)
+        self.write_bytes(struct.pack(fmt, *args))
+
+    def write_u8(self, val: int) -> None:
+        self._legacy_pack('<B', 1, val)
+
+    def write_u16(self, val: int) -> None:
+        self._legacy_pack('<H', 2, val)
+
+    def write_u32(self, val: int) -> None:
+        self._legacy_pack('<I', 4, val)
+
+    def write_float(self, val: float) -> None:
+        self._legacy_pack('<f', 4, val)
+
+    def write_vec2(self, val: bCVector2) -> None:
+        self._legacy_pack('<ff', 8, val.x, val.y)
+
+    def write_vec3(self, val: bCVector) -> None:
+        self._legacy_pack('<fff', 12, val.x, val.y, val.z)
+
+    def write_vec4(self, val: bCVector4) -> None:
+        self._legacy_pack('<ffff', 16, val.x, val.y, val.z, val.w)
+
+    def write_quat(self, val: bCQuaternion) -> None:
+        self._legacy_pack('<ffff', 16, val.x, val.y, val.z, val.w)
+
+
+_PRIMITIVES = {
+    'u8': (1, 0),
+    'u16': (2, 0),
+    'u32': (4, 0),
+    'float': (4, 0.0),
+    'vec2': (8, bCVector2(1.0, 2.0)),
+    'vec3': (12, bCVector(1.0, 2.0, 3.0)),
+    'vec4': (16, bCVector4(1.0, 2.0, 3.0, 4.0)),
+    'quat': (16, bCQuaternion(1.0, 2.0, 3.0, 4.0)),
+}
+
+
+def _time_reads(reader_type: type[BinaryReader], name: str, size: int, number: int) -> float:
+    reader = reader_type(bytes(size * number))
+    read = getattr(reader, f'read_{name}')
+    return timeit.timeit(read, number=number) / number
+
+
+def _time_writes(writer_type: type[BinaryWriter], name: str, value, number: int) -> float:
+    writer = writer_type()
+    write = getattr(writer, f'write_{name}')
+    return timeit.timeit(lambda: write(value), number=number) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200_000, help='Operations per primitive')
+    args = parser.parse_args()
+
+    print(f'{"primitive":<12} {"legacy ns":>10} {"fast ns":>10} {"speedup":>8}')
+    for name, (size, value) in _PRIMITIVES.items():
+        for op in ('read', 'write'):
+            if op == 'read':
+                legacy = _time_reads(_LegacyReader, name, size, args.number)
+                fast = _time_reads(BinaryReader, name, size, args.number)
+            else:
+                legacy = _time_writes(_LegacyWriter, name, value, args.number)
+                fast = _time_writes(BinaryWriter, name, value, args.number)
+            print(f'{op + " " + name:<12} {legacy * 1e9:>10.1f} {fast * 1e9:>10.1f} {legacy / fast:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
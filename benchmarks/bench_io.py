@@ -0,0 +1,216 @@
+"""
+Round-trip benchmark for the io layer on synthetic actors (.xact), motions (.xmot) and meshes (.xcmsh).
+
+Measures the read and write throughput (MB/s and objects/s) and the peak memory of each layer:
+    binary       BinaryReader/BinaryWriter, bulk (array) and per element (vec3) access
+    chunks       ChunkContainer, reading (eager and lazy) and writing the chunks of the actor or motion
+    genome_file  genome_file.read/write of the complete file
+
+Objects are vertices for actors and meshes, and key frames for motions. Each measurement is the best of several
+runs, the peak memory is measured in a separate run with tracemalloc. The results are written as JSON, to track
+regressions across releases.
+
+Usage: python -m benchmarks.bench_io [--bones N] [--vertices N] [--frames N] [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from collections.abc import Callable
+
+import g3blend
+
+from g3blend.io import genome_file
+from g3blend.io.animation.chunks import ChunkContainer
+from g3blend.io.animation.xact import ResourceAnimationActor
+from g3blend.io.animation.xmot import ResourceAnimationMotion
+from g3blend.io.binary import BinaryReader, BinarySerializable, BinaryWriter
+from g3blend.io.property_types import bCVector
+
+from . import synthetic
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _measure(func: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Return the best time of `repeat` runs, and the peak memory allocated during a run."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _result(
+    payload: str, layer: str, operation: str, func: Callable[[], object], num_bytes: int, num_objects: int, repeat: int
+) -> dict:
+    result = {'payload': payload, 'layer': layer, 'operation': operation, 'bytes': num_bytes, 'objects': num_objects}
+    try:
+        seconds, peak = _measure(func, repeat)
+    except NotImplementedError:
+        result['status'] = 'unsupported'
+        return result
+
+    seconds = max(seconds, 1e-9)
+    result.update(
+        status='ok',
+        seconds=seconds,
+        mb_per_s=num_bytes / 1e6 / seconds,
+        objects_per_s=num_objects / seconds,
+        peak_memory_bytes=peak,
+    )
+    return result
+
+
+def _write_genome_file(content: BinarySerializable) -> bytes:
+    writer = BinaryWriter()
+    genome_file.write(writer, content)
+    return writer.buf()
+
+
+def _write_chunks(container: BinarySerializable) -> bytes:
+    writer = BinaryWriter()
+    container.write(writer)
+    return writer.buf()
+
+
+def _bench_binary(num_vertices: int, repeat: int) -> list[dict]:
+    vectors = [bCVector(float(i), 1.0, 2.0) for i in range(num_vertices)]
+    floats = [c for v in vectors for c in (v.x, v.y, v.z)]
+    data = _write_vectors(vectors)
+
+    def read_vec3():
+        reader = BinaryReader(data)
+        return [reader.read_vec3() for _ in range(num_vertices)]
+
+    def read_array():
+        return BinaryReader(data).read_array('f', num_vertices * 3)
+
+    def write_array():
+        writer = BinaryWriter()
+        writer.write_array(floats, 'f')
+        return writer.buf()
+
+    return [
+        _result('vec3', 'binary', 'read', read_vec3, len(data), num_vertices, repeat),
+        _result('vec3', 'binary', 'write', lambda: _write_vectors(vectors), len(data), num_vertices, repeat),
+        _result('array', 'binary', 'read', read_array, len(data), num_vertices, repeat),
+        _result('array', 'binary', 'write', write_array, len(data), num_vertices, repeat),
+    ]
+
+
+def _write_vectors(vectors: list[bCVector]) -> bytes:
+    writer = BinaryWriter()
+    for vector in vectors:
+        writer.write_vec3(vector)
+    return bytes(writer.buf())
+
+
+def _bench_payload(
+    payload: str,
+    content: BinarySerializable,
+    container: Callable[[BinarySerializable], ChunkContainer] | None,
+    num_objects: int,
+    repeat: int,
+) -> list[dict]:
+    content_type = type(content)
+    data = synthetic.to_bytes(content)
+    parsed = genome_file.read(BinaryReader(data), content_type)
+    results = [
+        _result(
+            payload,
+            'genome_file',
+            'read',
+            lambda: genome_file.read(BinaryReader(data), content_type),
+            len(data),
+            num_objects,
+            repeat,
+        ),
+        _result(payload, 'genome_file', 'write', lambda: _write_genome_file(parsed), len(data), num_objects, repeat),
+    ]
+
+    if container is not None:
+        wrapper = container(parsed)
+        wrapper_type = type(wrapper)
+        wrapper_data = bytes(_write_chunks(wrapper))
+        results += [
+            _result(
+                payload,
+                'chunks',
+                'read',
+                lambda: BinaryReader(wrapper_data).read(wrapper_type),
+                len(wrapper_data),
+                num_objects,
+                repeat,
+            ),
+            _result(
+                payload,
+                'chunks',
+                'read_lazy',
+                lambda: BinaryReader(wrapper_data, lazy=True).read(wrapper_type),
+                len(wrapper_data),
+                num_objects,
+                repeat,
+            ),
+            _result(payload, 'chunks', 'write', lambda: _write_chunks(wrapper), len(wrapper_data), num_objects, repeat),
+        ]
+    return results
+
+
+def _container(content: BinarySerializable) -> ChunkContainer:
+    if isinstance(content, ResourceAnimationActor):
+        return content.actor
+    assert isinstance(content, ResourceAnimationMotion)
+    return content.motion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bones', type=int, default=50, help='Bones of actors and motions')
+    parser.add_argument('--vertices', type=int, default=20_000, help='Vertices of actors and per mesh element')
+    parser.add_argument('--frames', type=int, default=200, help='Key frames per track of motions')
+    parser.add_argument('--mesh-elements', type=int, default=4, help='Mesh elements of meshes')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, the best one is reported')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic contents')
+    parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout, help='JSON output file')
+    args = parser.parse_args()
+
+    actor = synthetic.make_actor(args.bones, args.vertices, seed=args.seed)
+    motion = synthetic.make_motion(args.bones, args.frames, seed=args.seed)
+    mesh = synthetic.make_mesh_complex(args.mesh_elements, args.vertices, seed=args.seed)
+
+    results = _bench_binary(args.vertices, args.repeat)
+    results += _bench_payload('xact', actor, _container, args.vertices, args.repeat)
+    results += _bench_payload('xmot', motion, _container, args.bones * 3 * args.frames, args.repeat)
+    results += _bench_payload('xcmsh', mesh, None, args.mesh_elements * args.vertices, args.repeat)
+
+    report = {
+        'g3blend_version': '.'.join(map(str, g3blend.bl_info['version'])),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__ if np is not None else None,
+        'parameters': {name: value for name, value in vars(args).items() if name != 'output'},
+        'results': results,
+    }
+    json.dump(report, args.output, indent=2)
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Generators for synthetic, but structurally valid Genome file contents of configurable size.
+
+The contents are deterministic for a given seed, so that benchmark runs are comparable.
+"""
+
+import array
+import random
+
+from g3blend.io import genome_file
+from g3blend.io.animation.chunks import (
+    AnimationType,
+    InterpolationType,
+    KeyFrameChunk,
+    MeshChunk,
+    MotionPartChunk,
+    NodeChunk,
+    SkinInfluence,
+    SkinningInfoChunk,
+    Submesh,
+)
+from g3blend.io.animation.xact import ResourceAnimationActor, eCWrapper_emfx2Actor
+from g3blend.io.animation.xmot import ResourceAnimationMotion, eCWrapper_emfx2Motion, eSFrameEffect
+from g3blend.io.binary import BinarySerializable, BinaryWriter
+from g3blend.io.property_sets import eCResourceMeshComplex_PS
+from g3blend.io.property_types import bCBox, bCDateTime, bCVector, bCVector2
+from g3blend.io.structs.mesh_element import (
+    _vertex_stream_to_struct_map,
+    create_vertex_struct_array,
+    eCMeshElement,
+    eEVertexStreamArrayType,
+)
+from g3blend.io.types import bCQuaternion
+
+
+_IDENTITY = bCQuaternion(0.0, 0.0, 0.0, 1.0)
+_ONE = bCVector(1.0, 1.0, 1.0)
+_ZERO = bCVector(0.0, 0.0, 0.0)
+# Empty trailing sections of a version 5 mesh element (two index arrays, no groups, no 24 byte records, index array).
+_EMPTY_TRAILING_DATA_V5 = bytes.fromhex('01 00000000 01 00000000 01 00000000 00000000 01 00000000')
+
+
+def _random_floats(rnd: random.Random, num: int) -> array.array:
+    return array.array('f', (rnd.uniform(-1.0, 1.0) for _ in range(num)))
+
+
+def _strip_indices(num_vertices: int) -> array.array:
+    """Triangle strip over the vertices, as a triangle list."""
+    return array.array('I', (i + j for i in range(max(0, num_vertices - 2)) for j in range(3)))
+
+
+def _make_submesh(rnd: random.Random, num_vertices: int, num_uv_sets: int) -> Submesh:
+    submesh = Submesh()
+    submesh.mat_id = 0
+    submesh.num_uv_sets = num_uv_sets
+    submesh.padding = bytes(2)
+    submesh.org_vertices = array.array('I', range(num_vertices))
+    submesh.positions = _random_floats(rnd, num_vertices * 3)
+    submesh.normals = _random_floats(rnd, num_vertices * 3)
+    submesh.uv_sets = [_random_floats(rnd, num_vertices * 2) for _ in range(num_uv_sets)]
+    submesh.indices = _strip_indices(num_vertices)
+    return submesh
+
+
+def make_actor(num_bones: int, num_vertices: int, num_uv_sets: int = 1, seed: int = 0) -> ResourceAnimationActor:
+    """Actor with a chain of bones, and a single skinned mesh with one submesh."""
+    rnd = random.Random(seed)  # noqa: S311
+
+    actor = eCWrapper_emfx2Actor()
+    actor.high_version = 1
+    actor.low_version = 1
+    actor.chunks = []
+
+    for i in range(num_bones):
+        node = actor.add_chunk(NodeChunk)
+        node.position = bCVector(0.0, 0.0, 10.0 if i else 0.0)
+        node.rotation = _IDENTITY
+        node.scale_orient = _IDENTITY
+        node.scale = _ONE
+        node.shear = _ZERO
+        node.name = f'Bone_{i}'
+        node.parent = f'Bone_{i - 1}' if i else ''
+
+    submesh = _make_submesh(rnd, num_vertices, num_uv_sets)
+    mesh = actor.add_chunk(MeshChunk)
+    mesh.node_number = 0
+    mesh.num_org_verts = num_vertices
+    mesh.total_verts = num_vertices
+    mesh.total_indices = len(submesh.indices)
+    mesh.num_uv_sets = num_uv_sets
+    mesh.is_collision_mesh = False
+    mesh.padding = bytes(3)
+    mesh.submeshes = [submesh]
+
+    skinning = actor.add_chunk(SkinningInfoChunk)
+    skinning.node_index = 0
+    skinning.influences = []
+    for _ in range(num_vertices):
+        weight = rnd.random()
+        influences = []
+        for node_index, node_weight in ((rnd.randrange(num_bones), weight), (rnd.randrange(num_bones), 1 - weight)):
+            influence = SkinInfluence()
+            influence.node_index = node_index
+            influence.padding = bytes(2)
+            influence.weight = node_weight
+            influences.append(influence)
+        skinning.influences.append(influences)
+
+    actor.materials = []
+    actor.ambient_occlusion = [[rnd.getrandbits(32) for _ in range(num_vertices)]]
+    actor.tangent_vertices = [[bCVector(*_random_floats(rnd, 3)) for _ in range(num_vertices)]]
+
+    xact = ResourceAnimationActor()
+    xact.resource_size = 0
+    xact.resource_priority = 0.0
+    xact.native_file_time = bCDateTime(0)
+    xact.native_file_size = 0
+    xact.boundary = bCBox(bCVector(-1.0, -1.0, -1.0), _ONE)
+    xact.look_at_constraints = []
+    xact.lods = []
+    xact.actor = actor
+    return xact
+
+
+def make_motion(num_bones: int, num_frames: int, seed: int = 0) -> ResourceAnimationMotion:
+    """Motion with a linearly interpolated position, rotation and scale track per bone."""
+    rnd = random.Random(seed)  # noqa: S311
+
+    motion = eCWrapper_emfx2Motion()
+    motion.chunks = []
+    times = array.array('f', (i / 25 for i in range(num_frames)))
+    for i in range(num_bones):
+        motion_part = motion.add_chunk(MotionPartChunk)
+        motion_part.pose_position = _ZERO
+        motion_part.pose_rotation = _IDENTITY
+        motion_part.pose_scale = _ONE
+        motion_part.bind_pose_position = _ZERO
+        motion_part.bind_pose_rotation = _IDENTITY
+        motion_part.bind_pose_scale = _ONE
+        motion_part.name = f'Bone_{i}'
+
+        for animation_type in (AnimationType.Position, AnimationType.Rotation, AnimationType.Scaling):
+            key_frame = motion.add_chunk(KeyFrameChunk)
+            key_frame.interpolation_type = InterpolationType.Linear
+            key_frame.animation_type = animation_type
+            key_frame.times = times
+            key_frame.values = _random_floats(rnd, num_frames * (4 if animation_type == AnimationType.Rotation else 3))
+
+    xmot = ResourceAnimationMotion()
+    xmot.resource_size = 0
+    xmot.resource_priority = 0.0
+    xmot.native_file_time = bCDateTime(0)
+    xmot.native_file_size = 0
+    xmot.unk_file_time = bCDateTime(0)
+    xmot.frame_effects = [eSFrameEffect(0, 'Effect')]
+    xmot.motion = motion
+    return xmot
+
+
+def _make_mesh_element(rnd: random.Random, index: int, num_vertices: int) -> eCMeshElement:
+    stream_arrays = []
+    for stream_type, elements in (
+        (eEVertexStreamArrayType.Face, _strip_indices(num_vertices)),
+        (eEVertexStreamArrayType.VertexPosition, [bCVector(*_random_floats(rnd, 3)) for _ in range(num_vertices)]),
+        (eEVertexStreamArrayType.Normal, [bCVector(*_random_floats(rnd, 3)) for _ in range(num_vertices)]),
+        (eEVertexStreamArrayType.Diffuse, array.array('I', (rnd.getrandbits(32) for _ in range(num_vertices)))),
+        (eEVertexStreamArrayType.TextureCoordinate, [bCVector2(*_random_floats(rnd, 2)) for _ in range(num_vertices)]),
+    ):
+        stream_array = create_vertex_struct_array(stream_type)
+        stream_array.elements = elements
+        stream_arrays.append(stream_array)
+
+    fvf = 0
+    for stream_array in stream_arrays:
+        fvf |= _vertex_stream_to_struct_map[stream_array.vertex_stream_type].fvf
+
+    bounding_box = bCBox(bCVector(-1.0, -1.0, -1.0), _ONE)
+    return eCMeshElement(5, fvf, bounding_box, 0, f'Material_{index}', stream_arrays, _EMPTY_TRAILING_DATA_V5)
+
+
+def make_mesh_complex(num_elements: int, num_vertices: int, seed: int = 0) -> eCResourceMeshComplex_PS:
+    """Mesh with the given number of mesh elements, each with positions, normals, colors and uvs."""
+    rnd = random.Random(seed)  # noqa: S311
+    mesh_elements = [_make_mesh_element(rnd, i, num_vertices) for i in range(num_elements)]
+    return eCResourceMeshComplex_PS('eCResourceMeshComplex_PS', [], 0x22, 30, 0, 0, 0.0, mesh_elements)
+
+
+def to_bytes(content: BinarySerializable) -> bytes:
+    """Serialize as Genome file."""
+    writer = BinaryWriter()
+    genome_file.write(writer, content)
+    return bytes(writer.buf())
@@ -1,6 +1,11 @@
-import bpy
+try:
+    import bpy
+except ModuleNotFoundError:
+    # Outside of Blender only the io package is usable, e.g. for benchmarks and tooling.
+    bpy = None
 
-from . import extension, ui
+if bpy is not None:
+    from . import extension, ui
 
 
 bl_info = {
@@ -28,15 +33,16 @@ def menu_func_import(self, _context):
     self.layout.operator(ui.io_import_xcmsh.ImportXcmsh.bl_idname, text='Gothic 3 Mesh (.xcmsh)')
 
 
-modules = (
-    ui.frame_effects,
-    ui.io_import_xact,
-    ui.io_import_xmot,
-    ui.io_import_xcmsh,
-    ui.io_export_xact,
-    ui.io_export_xmot,
-    extension,
-)
+if bpy is not None:
+    modules = (
+        ui.frame_effects,
+        ui.io_import_xact,
+        ui.io_import_xmot,
+        ui.io_import_xcmsh,
+        ui.io_export_xact,
+        ui.io_export_xmot,
+        extension,
+    )
 
 
 def register():
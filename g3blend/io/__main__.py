@@ -0,0 +1,174 @@
+# noqa: A005 Shadowing io is fine
+"""
+Validate Genome files without Blender.
+
+Parses all supported files (.xact, .xmot, .xcmsh, .xshmat) in the given files and directory trees. Unless
+--no-roundtrip is given, each file is additionally re-serialized and parsed again, which has to reproduce the
+same bytes. Files whose re-serialization is identical to the original file are reported as exact.
+
+Exits with a non-zero status if any file fails to parse or does not round-trip.
+
+Usage: python -m g3blend.io [-j N] [--no-roundtrip] [-v] PATH...
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from . import genome_file
+from .animation.xact import ResourceAnimationActor
+from .animation.xmot import ResourceAnimationMotion
+from .binary import BinaryReader, BinarySerializable, BinaryWriter
+from .property_sets import eCResourceMeshComplex_PS, eCResourceShaderMaterial_PS
+
+
+# File extension -> (content type, allow_fallback)
+_CONTENT_TYPES: dict[str, tuple[type[BinarySerializable], bool]] = {
+    '.xact': (ResourceAnimationActor, False),
+    '.xmot': (ResourceAnimationMotion, False),
+    '.xcmsh': (eCResourceMeshComplex_PS, True),
+    '.xshmat': (eCResourceShaderMaterial_PS, True),
+}
+
+# Parsed, and re-serialized to the original bytes.
+_EXACT = 'exact'
+# Parsed, and re-serialization is stable, but differs from the original bytes.
+_STABLE = 'stable'
+# Parsed (round-trip was not requested).
+_PARSED = 'parsed'
+# Parsed, but serialization is not implemented for the content.
+_UNSUPPORTED = 'unsupported'
+# Parsed, but re-serialization is not stable.
+_UNSTABLE = 'unstable'
+# Failed to parse.
+_ERROR = 'error'
+
+_FAILURES = {_UNSTABLE, _ERROR}
+
+
+@dataclass(slots=True)
+class _Result:
+    path: Path
+    size: int
+    status: str
+    message: str = ''
+
+
+def _serialize(content: BinarySerializable) -> bytes:
+    writer = BinaryWriter()
+    genome_file.write(writer, content)
+    return bytes(writer.buf())
+
+
+def _check_file(path: Path, roundtrip: bool) -> _Result:  # noqa: PLR0911
+    content_type, allow_fallback = _CONTENT_TYPES[path.suffix.lower()]
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return _Result(path, 0, _ERROR, str(e))
+
+    try:
+        content = genome_file.read(BinaryReader(data), content_type, allow_fallback)
+    except Exception as e:  # noqa: BLE001
+        return _Result(path, len(data), _ERROR, f'{type(e).__name__}: {e}')
+
+    if not roundtrip:
+        return _Result(path, len(data), _PARSED)
+
+    try:
+        first = _serialize(content)
+        second = _serialize(genome_file.read(BinaryReader(first), content_type, allow_fallback))
+    except NotImplementedError:
+        return _Result(path, len(data), _UNSUPPORTED, f'Writing {content_type.__name__} is not supported.')
+    except Exception as e:  # noqa: BLE001
+        return _Result(path, len(data), _UNSTABLE, f'{type(e).__name__}: {e}')
+
+    if first != second:
+        return _Result(path, len(data), _UNSTABLE, 'Re-serialization is not stable.')
+    if first != data:
+        return _Result(path, len(data), _STABLE, f'Differs from original ({len(first)} vs. {len(data)} bytes).')
+    return _Result(path, len(data), _EXACT)
+
+
+def _collect_files(paths: Iterable[Path]) -> list[Path]:
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() in _CONTENT_TYPES and p.is_file()))
+        elif path.suffix.lower() in _CONTENT_TYPES:
+            files.append(path)
+        else:
+            raise ValueError(f'Unsupported file type: {path}')
+    return files
+
+
+def _check_files(files: list[Path], roundtrip: bool, jobs: int) -> Iterator[_Result]:
+    check = partial(_check_file, roundtrip=roundtrip)
+    if jobs <= 1:
+        yield from map(check, files)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(check, files, chunksize=max(1, min(64, len(files) // (jobs * 8))))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m g3blend.io', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('paths', nargs='+', type=Path, help='Files or directories to check')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+    parser.add_argument('--no-roundtrip', action='store_true', help='Only parse, do not re-serialize')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Report every file, not only failures')
+    args = parser.parse_args()
+
+    try:
+        files = _collect_files(args.paths)
+    except ValueError as e:
+        parser.error(str(e))
+
+    show_progress = sys.stderr.isatty()
+    counts = Counter()
+    num_bytes = 0
+    start = last_progress = time.perf_counter()
+    for done, result in enumerate(_check_files(files, not args.no_roundtrip, args.jobs), start=1):
+        counts[result.status] += 1
+        num_bytes += result.size
+        if args.verbose or result.status not in (_EXACT, _STABLE, _PARSED):
+            if show_progress:
+                print('\r\033[K', end='', file=sys.stderr)
+            print(f'{result.status.upper():<11} {result.path}' + (f': {result.message}' if result.message else ''))
+
+        now = time.perf_counter()
+        if show_progress and (now - last_progress >= 0.2 or done == len(files)):
+            last_progress = now
+            elapsed = max(now - start, 1e-9)
+            print(
+                f'\r\033[K{done}/{len(files)} files, {num_bytes / 1e6 / elapsed:.1f} MB/s',
+                end='',
+                file=sys.stderr,
+                flush=True,
+            )
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    if show_progress:
+        print(file=sys.stderr)
+    summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items()))
+    print(
+        f'Checked {len(files)} files ({num_bytes / 1e6:.1f} MB) in {elapsed:.2f} s: {summary or "nothing to do"}. '
+        f'Throughput: {len(files) / elapsed:.1f} files/s, {num_bytes / 1e6 / elapsed:.1f} MB/s.'
+    )
+
+    return 1 if any(counts[status] for status in _FAILURES) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,12 @@
+import array
+
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from enum import Enum, IntEnum
 from typing import Generic, Optional, TypeVar
 
-from ..binary import BinaryReader, BinarySerializable, BinaryWriter
+from ..binary import BinaryReader, BinarySerializable, BinaryWriter, InterleavedField
 from ..property_types import bCVector, bCVector2
 from ..types import FloatColor, bCQuaternion
 
@@ -64,6 +67,7 @@ class Chunk(BinarySerializable, ABC):
 
 
 TChunk = TypeVar('TChunk', bound=Chunk)
+T = TypeVar('T')
 
 
 class AbstractChunk(Chunk, ABC):
@@ -159,12 +163,21 @@ class Vertex(BinarySerializable):
         return bCVector(self.normal.z, self.normal.y, self.normal.x)
 
 
+def _vertex_fields(num_uv_sets: int) -> list[InterleavedField]:
+    # org_vertex, position, normal, uv_sets (a vertex has a size of 28 + 8 * num_uv_sets bytes)
+    return [('I', 1), ('f', 3), ('f', 3)] + [('f', 2)] * num_uv_sets
+
+
 class Submesh(BinarySerializable):
     mat_id: int
     num_uv_sets: int
     padding: bytes
-    vertices: list[Vertex]
-    indices: list[int]
+    # The vertices are stored as structure of arrays, each array is flat and keeps the component order of the file.
+    org_vertices: Sequence[int]  # one per vertex
+    positions: Sequence[float]  # three per vertex (Z, Y, X)
+    normals: Sequence[float]  # three per vertex (Z, Y, X)
+    uv_sets: list[Sequence[float]]  # per uv set, two per vertex
+    indices: Sequence[int]
 
     def read(self, reader: BinaryReader) -> None:
         raise NotImplementedError('No size provided.')
@@ -179,21 +192,73 @@ class Submesh(BinarySerializable):
         if override_num_uv_sets is not None:
             self.num_uv_sets = override_num_uv_sets
 
-        self.padding = reader.read_bytes(2)
+        self.padding = reader.read_bytes(2, copy=True)
         num_indices = reader.read_u32()
         num_verts = reader.read_u32()
-        vertex_size = 28 + 8 * self.num_uv_sets
-        self.vertices = reader.read_list(read=lambda r: r.read(Vertex, vertex_size), num=num_verts)
-        self.indices = reader.read_list(read=BinaryReader.read_u32, num=num_indices)
+        self.org_vertices, self.positions, self.normals, *self.uv_sets = reader.read_interleaved(
+            num_verts, _vertex_fields(self.num_uv_sets)
+        )
+        self.indices = reader.read_array('I', num_indices)
 
     def write(self, writer: BinaryWriter) -> None:
         writer.write_u8(self.mat_id)
         writer.write_u8(self.num_uv_sets)
         writer.write_bytes(self.padding)
         writer.write_u32(len(self.indices))
-        writer.write_u32(len(self.vertices))
-        writer.write_iter(self.vertices)
-        writer.write_iter(self.indices, write=BinaryWriter.write_u32)
+        writer.write_u32(self.num_vertices())
+        writer.write_interleaved(
+            self.num_vertices(),
+            _vertex_fields(self.num_uv_sets),
+            [self.org_vertices, self.positions, self.normals, *self.uv_sets],
+        )
+        writer.write_array(self.indices, 'I')
+
+    def num_vertices(self) -> int:
+        return len(self.org_vertices)
+
+    def get_vertex(self, index: int) -> Vertex:
+        vertex = Vertex()
+        vertex.org_vertex = int(self.org_vertices[index])
+        vertex.position = bCVector(*map(float, self.positions[index * 3 : index * 3 + 3]))
+        vertex.normal = bCVector(*map(float, self.normals[index * 3 : index * 3 + 3]))
+        vertex.uv_sets = [bCVector2(*map(float, uv_set[index * 2 : index * 2 + 2])) for uv_set in self.uv_sets]
+        return vertex
+
+    @property
+    def vertices(self) -> Sequence[Vertex]:
+        """Per-vertex view, the Vertex objects are created on access (prefer the packed arrays where possible)."""
+        return _PackedView(self.num_vertices, self.get_vertex)
+
+    @vertices.setter
+    def vertices(self, vertices: Sequence[Vertex]) -> None:
+        self.org_vertices = array.array('I', (v.org_vertex for v in vertices))
+        self.positions = array.array('f', (c for v in vertices for c in (v.position.x, v.position.y, v.position.z)))
+        self.normals = array.array('f', (c for v in vertices for c in (v.normal.x, v.normal.y, v.normal.z)))
+        self.uv_sets = [
+            array.array('f', (c for v in vertices for c in (v.uv_sets[i].x, v.uv_sets[i].y)))
+            for i in range(self.num_uv_sets)
+        ]
+
+
+class _PackedView(Sequence[T]):
+    """Read-only sequence over packed data, the elements are created on access."""
+
+    def __init__(self, num: Callable[[], int], get: Callable[[int], T]):
+        self._num = num
+        self._get = get
+
+    def __len__(self) -> int:
+        return self._num()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Index out of range.')
+        return self._get(index)
 
 
 class MeshChunk(AbstractChunk):
@@ -217,7 +282,7 @@ class MeshChunk(AbstractChunk):
         num_sub_meshes = reader.read_u32()
         self.num_uv_sets = reader.read_u32()
         self.is_collision_mesh = reader.read_bool()
-        self.padding = reader.read_bytes(3)
+        self.padding = reader.read_bytes(3, copy=True)
         self.submeshes = reader.read_list(read=lambda r: r.read(Submesh, self.num_uv_sets), num=num_sub_meshes)
 
     def write(self, writer: BinaryWriter) -> None:
@@ -239,7 +304,7 @@ class SkinInfluence(BinarySerializable):
 
     def read(self, reader: BinaryReader) -> None:
         self.node_index = reader.read_u16()
-        self.padding = reader.read_bytes(2)
+        self.padding = reader.read_bytes(2, copy=True)
         self.weight = reader.read_float()
 
     def write(self, writer: BinaryWriter) -> None:
@@ -315,6 +380,11 @@ class QuaternionKeyFrame(KeyFrame[bCQuaternion]):
         writer.write_quat(self.value)
 
 
+def _key_frame_fields(animation_type: AnimationType) -> list[InterleavedField]:
+    # time, value (a key frame has a size of 16 bytes, or 20 bytes for rotations)
+    return [('f', 1), ('f', 4 if animation_type == AnimationType.Rotation else 3)]
+
+
 class KeyFrameChunk(AbstractChunk):
     """A key frame chunk applies to the most recent motion part chunk."""
 
@@ -323,7 +393,9 @@ class KeyFrameChunk(AbstractChunk):
 
     interpolation_type: InterpolationType
     animation_type: AnimationType
-    frames: list[KeyFrame]
+    # The key frames are stored as structure of arrays, each array is flat and keeps the component order of the file.
+    times: Sequence[float]  # one per key frame, in seconds
+    values: Sequence[float]  # three per key frame (X, Y, Z), or four for rotations (X, Y, Z, W)
 
     def read(self, reader: BinaryReader) -> None:
         key_frame_count = reader.read_u32()
@@ -331,18 +403,36 @@ class KeyFrameChunk(AbstractChunk):
         self.animation_type = AnimationType(reader.read_char())
         reader.skip(2)  # Padding
 
-        match self.animation_type:
-            case AnimationType.Position | AnimationType.Scaling:
-                self.frames = reader.read_list(VectorKeyFrame, num=key_frame_count)
-            case AnimationType.Rotation:
-                self.frames = reader.read_list(QuaternionKeyFrame, num=key_frame_count)
+        self.times, self.values = reader.read_interleaved(key_frame_count, _key_frame_fields(self.animation_type))
 
     def write(self, writer: BinaryWriter) -> None:
-        writer.write_u32(len(self.frames))
+        writer.write_u32(self.num_frames())
         writer.write_char(self.interpolation_type.value)
         writer.write_char(self.animation_type.value)
         writer.write_u16(0)  # Padding
-        writer.write_iter(self.frames)
+        writer.write_interleaved(self.num_frames(), _key_frame_fields(self.animation_type), [self.times, self.values])
+
+    def num_frames(self) -> int:
+        return len(self.times)
+
+    def get_frame(self, index: int) -> KeyFrame:
+        time = float(self.times[index])
+        if self.animation_type == AnimationType.Rotation:
+            return QuaternionKeyFrame(time, bCQuaternion(*map(float, self.values[index * 4 : index * 4 + 4])))
+        return VectorKeyFrame(time, bCVector(*map(float, self.values[index * 3 : index * 3 + 3])))
+
+    @property
+    def frames(self) -> Sequence[KeyFrame]:
+        """Per-key frame view, the KeyFrame objects are created on access (prefer the packed arrays where possible)."""
+        return _PackedView(self.num_frames, self.get_frame)
+
+    @frames.setter
+    def frames(self, frames: Sequence[KeyFrame]) -> None:
+        self.times = array.array('f', (f.time for f in frames))
+        if self.animation_type == AnimationType.Rotation:
+            self.values = array.array('f', (c for f in frames for c in (f.value.x, f.value.y, f.value.z, f.value.w)))
+        else:
+            self.values = array.array('f', (c for f in frames for c in (f.value.x, f.value.y, f.value.z)))
 
 
 class MotionPartChunk(AbstractChunk):
@@ -468,31 +558,102 @@ def get_chunk_type(chunk_id: int, version: int):  # noqa: PLR0911
     raise ValueError(f'ChunkID {chunk_id} with version {version} is not supported.')
 
 
+@dataclass(frozen=True, slots=True)
+class ChunkHeader:
+    chunk_id: int
+    version: int
+    # Position and size of the chunk data following the header
+    offset: int
+    size: int
+
+
 class ChunkContainer:
-    chunks: list[Chunk]
+    """
+    Ordered list of chunks with an index by chunk ID.
+
+    Chunks have to be added via add_chunk() or by assigning the chunks property, so that the index stays up to date.
+    For the same reason the chunks property returns a tuple, which cannot be modified in place.
+
+    When read lazily, only the chunk headers are read up front, and each chunk is decoded on first access. Accessing
+    the chunks property decodes all remaining chunks, whereas the typed lookups only decode the matching chunks.
+    """
+
+    # Chunks that have not been decoded yet are represented by their header.
+    _chunks: list[Chunk | ChunkHeader]
+    # Chunk ID -> Indices into _chunks
+    _chunk_index: dict[int, list[int]]
+    # Reader to decode pending chunks from, None if all chunks are decoded
+    _chunk_reader: Optional[BinaryReader]
+
+    @property
+    def chunks(self) -> tuple[Chunk, ...]:
+        if self._chunk_reader is not None:
+            for i in range(len(self._chunks)):
+                self._chunk_at(i)
+            self._chunk_reader = None
+        return tuple(self._chunks)
+
+    @chunks.setter
+    def chunks(self, chunks: Iterable[Chunk]) -> None:
+        self._chunks = []
+        self._chunk_index = {}
+        self._chunk_reader = None
+        for chunk in chunks:
+            self._append_chunk(chunk)
 
     def has_chunk(self, chunk_type: type[TChunk]) -> bool:
-        return any(self.get_chunks_by_type(chunk_type))
+        return chunk_type.ID in self._chunk_index
 
     def get_chunk_by_type(self, chunk_type: type[TChunk]) -> TChunk:
-        typed_chunks = self.get_chunks_by_type(chunk_type)
-        assert len(typed_chunks) == 1
-        return typed_chunks[0]
+        indices = self._chunk_index.get(chunk_type.ID, [])
+        assert len(indices) == 1
+        return self._chunk_at(indices[0])
 
     def get_chunks_by_type(self, chunk_type: type[TChunk]) -> list[TChunk]:
-        return [c for c in self.chunks if c.chunk_id == chunk_type.ID]
+        return list(self.iter_chunks_by_type(chunk_type))
+
+    def iter_chunks_by_type(self, chunk_type: type[TChunk]) -> Iterator[TChunk]:
+        for i in self._chunk_index.get(chunk_type.ID, ()):
+            yield self._chunk_at(i)
+
+    def read_chunks(self, reader: BinaryReader, offset_end: int, lazy: Optional[bool] = None) -> None:
+        """
+        Read the chunks up to `offset_end`.
+
+        If `lazy` is not given, the chunks are read lazily if the reader was created with `lazy` set.
+        """
+        if lazy is None:
+            lazy = reader.lazy
 
-    def read_chunks(self, reader: BinaryReader, offset_end: int):
         self.chunks = []
+        for header in self.iter_chunk_headers(reader, offset_end):
+            if lazy:
+                self._append_chunk(header)
+                self._chunk_reader = reader
+            else:
+                self._append_chunk(self._read_chunk(reader, header))
+
+    @staticmethod
+    def iter_chunk_headers(reader: BinaryReader, offset_end: int) -> Iterator[ChunkHeader]:
+        """
+        Iterate over the headers of the chunks up to `offset_end`.
+
+        While a header is being processed, the reader is positioned at the start of the chunk data. Afterward, the
+        reader is moved to the next chunk, regardless of whether the chunk data has been read.
+        """
         while reader.position() < offset_end:
             chunk_id = reader.read_u32()
             chunk_size = reader.read_u32()
             chunk_version = reader.read_u32()
-            chunk_type = get_chunk_type(chunk_id, chunk_version)
-            chunk = reader.read(chunk_type, chunk_size)
-            chunk.chunk_id = chunk_id
-            chunk.version = chunk_version
-            self.chunks.append(chunk)
+            header = ChunkHeader(chunk_id, chunk_version, reader.position(), chunk_size)
+            yield header
+            reader.seek(header.offset + header.size)
+
+    @classmethod
+    def iter_chunks(cls, reader: BinaryReader, offset_end: int) -> Iterator[Chunk]:
+        """Decode the chunks up to `offset_end` one at a time, without keeping them around."""
+        for header in cls.iter_chunk_headers(reader, offset_end):
+            yield cls._read_chunk(reader, header)
 
     def write_chunks(self, writer: BinaryWriter) -> None:
         for chunk in self.chunks:
@@ -501,12 +662,31 @@ class ChunkContainer:
             writer.write_u32(0)
             writer.write_u32(chunk.version)
             writer.write(chunk)
-            with writer.at_position(chunk_size_offset) as pos:
-                writer.write_u32(pos - chunk_size_offset - 8)
+            writer.patch_u32(chunk_size_offset, writer.position() - chunk_size_offset - 8)
 
     def add_chunk(self, chunk_type: type[TChunk]) -> TChunk:
         chunk = chunk_type()
         chunk.chunk_id = chunk_type.ID
         chunk.version = chunk_type.VERSION
-        self.chunks.append(chunk)
+        self._append_chunk(chunk)
+        return chunk
+
+    def _append_chunk(self, chunk: Chunk | ChunkHeader) -> None:
+        self._chunk_index.setdefault(chunk.chunk_id, []).append(len(self._chunks))
+        self._chunks.append(chunk)
+
+    def _chunk_at(self, index: int) -> Chunk:
+        chunk = self._chunks[index]
+        if isinstance(chunk, ChunkHeader):
+            with self._chunk_reader.at_position(chunk.offset):
+                chunk = self._read_chunk(self._chunk_reader, chunk)
+            self._chunks[index] = chunk
+        return chunk
+
+    @staticmethod
+    def _read_chunk(reader: BinaryReader, header: ChunkHeader) -> Chunk:
+        chunk_type = get_chunk_type(header.chunk_id, header.version)
+        chunk = reader.read(chunk_type, header.size)
+        chunk.chunk_id = header.chunk_id
+        chunk.version = header.version
         return chunk
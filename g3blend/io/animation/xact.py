@@ -77,8 +77,7 @@ class eCWrapper_emfx2Actor(BinarySerializable, ChunkContainer):
         writer.write_u8(self.high_version)
         writer.write_u8(self.low_version)
         self.write_chunks(writer)
-        with writer.at_position(size_offset) as pos:
-            writer.write_u32(pos - size_offset - 4)
+        writer.patch_u32(size_offset, writer.position() - size_offset - 4)
         writer.write_list(self.materials)
         writer.write_prefixed_list(
             self.ambient_occlusion, lambda w, v: w.write_prefixed_list(v, BinaryWriter.write_u32)
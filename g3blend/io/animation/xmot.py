@@ -1,6 +1,7 @@
+from collections.abc import Iterator
 from dataclasses import dataclass
 
-from ..animation.chunks import ChunkContainer
+from ..animation.chunks import Chunk, ChunkContainer
 from ..binary import BinaryReader, BinarySerializable, BinaryWriter
 from ..property_types import bCDateTime
 
@@ -25,6 +26,19 @@ class eCWrapper_emfx2Motion(BinarySerializable, ChunkContainer):
     _LOW_VERSION = 1
 
     def read(self, reader: BinaryReader) -> None:
+        self.read_chunks(reader, self.read_header(reader))
+
+    def read_streamed(self, reader: BinaryReader) -> Iterator[Chunk]:
+        """
+        Read the header, and return an iterator that decodes the chunks one at a time.
+
+        The chunks are not stored in the container. The reader must not be used otherwise until the iterator is
+        exhausted.
+        """
+        return self.iter_chunks(reader, self.read_header(reader))
+
+    def read_header(self, reader: BinaryReader) -> int:
+        """Read the header, and return the end offset of the chunks."""
         offset_end = reader.read_u32() + reader.position()
         if not reader.expect_bytes(self._LMA_MAGIC):
             raise ValueError('Invalid eCWrapper_emfx2Motion.')
@@ -41,7 +55,7 @@ class eCWrapper_emfx2Motion(BinarySerializable, ChunkContainer):
         if reader.read_bool():
             raise ValueError('Invalid eCWrapper_emfx2Motion.')
 
-        self.read_chunks(reader, offset_end)
+        return offset_end
 
     def write(self, writer: BinaryWriter) -> None:
         size_offset = writer.position()
@@ -51,8 +65,7 @@ class eCWrapper_emfx2Motion(BinarySerializable, ChunkContainer):
         writer.write_u8(self._LOW_VERSION)
         writer.write_bool(False)
         self.write_chunks(writer)
-        with writer.at_position(size_offset) as pos:
-            writer.write_u32(pos - size_offset - 4)
+        writer.patch_u32(size_offset, writer.position() - size_offset - 4)
 
 
 class ResourceAnimationMotion(BinarySerializable):  # eCResourceAnimationMotion_PS
@@ -65,6 +78,22 @@ class ResourceAnimationMotion(BinarySerializable):  # eCResourceAnimationMotion_
     motion: eCWrapper_emfx2Motion
 
     def read(self, reader: BinaryReader) -> None:
+        self.read_header(reader)
+        self.motion = reader.read(eCWrapper_emfx2Motion)
+
+    def read_streamed(self, reader: BinaryReader) -> Iterator[Chunk]:
+        """
+        Read everything up to the chunks of the motion, and return an iterator that decodes the chunks one at a time.
+
+        Processing the chunks as they are decoded bounds the memory usage by the largest chunk instead of by the
+        whole file. The motion attribute is left unset.
+        """
+        self.read_header(reader)
+        motion = eCWrapper_emfx2Motion.__new__(eCWrapper_emfx2Motion)
+        return motion.read_streamed(reader)
+
+    def read_header(self, reader: BinaryReader) -> None:
+        """Read everything except the motion."""
         version = reader.read_u16()
         self.resource_size = reader.read_u32()
         self.resource_priority = reader.read_float()
@@ -72,7 +101,6 @@ class ResourceAnimationMotion(BinarySerializable):  # eCResourceAnimationMotion_
         self.native_file_size = reader.read_u32()
         self.unk_file_time = reader.read(bCDateTime) if version >= 3 else self.native_file_time
         self.frame_effects = reader.read_list(eSFrameEffect, num=reader.read_u16()) if version >= 2 else []
-        self.motion = reader.read(eCWrapper_emfx2Motion)
 
     def write(self, writer: BinaryWriter) -> None:
         writer.write_u16(5)
@@ -1,10 +1,21 @@
+import array
+import mmap
+import os
 import struct
+import sys
 
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional, TypeVar
+from typing import Any, BinaryIO, Optional, TypeVar
+
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is bundled with Blender, but not necessarily available when the io package is used standalone.
+    np = None
 
 
 class BinarySerializable(ABC):
@@ -25,19 +36,103 @@ TBinarySerializable = TypeVar('TBinarySerializable', bound=BinarySerializable)
 T = TypeVar('T')
 _ENCODING = 'windows-1252'
 
+# Precompiled structs for all primitives, so that reading and writing does not have to parse format strings.
+_CHAR = struct.Struct('<c')
+_U8 = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_I8 = struct.Struct('<b')
+_I16 = struct.Struct('<h')
+_I32 = struct.Struct('<i')
+_I64 = struct.Struct('<q')
+_FLOAT = struct.Struct('<f')
+_VEC2 = struct.Struct('<ff')
+_VEC3 = struct.Struct('<fff')
+_VEC4 = struct.Struct('<ffff')
+
+# Bound methods for the hot paths (vertices, key frames, chunk headers), saves the attribute lookup on each call.
+_unpack_u8 = _U8.unpack_from
+_unpack_u16 = _U16.unpack_from
+_unpack_u32 = _U32.unpack_from
+_unpack_float = _FLOAT.unpack_from
+_unpack_vec2 = _VEC2.unpack_from
+_unpack_vec3 = _VEC3.unpack_from
+_unpack_vec4 = _VEC4.unpack_from
+_pack_u8 = _U8.pack_into
+_pack_u16 = _U16.pack_into
+_pack_u32 = _U32.pack_into
+_pack_float = _FLOAT.pack_into
+_pack_vec2 = _VEC2.pack_into
+_pack_vec3 = _VEC3.pack_into
+_pack_vec4 = _VEC4.pack_into
+
+# Array reads and writes can skip the byte swap on little-endian hosts (the native byte order of array.array).
+_NEEDS_BYTESWAP = sys.byteorder != 'little'
+
+
+def _array_item_size(dtype: str) -> int:
+    return struct.calcsize('<' + dtype)
+
+
+# An interleaved field consists of a struct format character and the number of values of that type per record.
+InterleavedField = tuple[str, int]
+
+
+def _interleaved_stride(fields: Sequence[InterleavedField]) -> int:
+    return sum(_array_item_size(dtype) * num for dtype, num in fields)
+
+
+def _interleaved_record(fields: Sequence[InterleavedField]) -> 'np.dtype':
+    return np.dtype([(f'f{i}', '<' + dtype, (num,)) for i, (dtype, num) in enumerate(fields)])
+
+
+def _interleaved_views(raw: memoryview, fields: Sequence[InterleavedField]) -> Iterable[tuple[memoryview, int, int]]:
+    # Yields for each field a view over the raw records cast to the field type, and the record stride in items of
+    # that type, so that slicing with the stride visits the field of each record.
+    stride = _interleaved_stride(fields)
+    offset = 0
+    for dtype, num in fields:
+        size = _array_item_size(dtype)
+        if stride % size != 0 or offset % size != 0:
+            raise ValueError(f'Unaligned interleaved field {dtype} at offset {offset}.')
+        yield raw[offset:].cast(dtype), stride // size, num
+        offset += size * num
+
+
+def _map_file(file: Path) -> memoryview:
+    with file.open('rb') as f:
+        # Mapping an empty file is not supported.
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        # The mapping stays valid after the file is closed, and is released once the last view on it is gone.
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
 
 class BinaryReader:
-    _buf: bytes | bytearray
+    _buf: bytes | bytearray | memoryview
     _pos: int
     _stringtable: Optional[list[str]]
+    lazy: bool
+
+    def __init__(self, data: bytes | bytearray | memoryview | Path, use_mmap: bool = False, lazy: bool = False):
+        """
+        Create a reader for the given data or file.
+
+        If `use_mmap` is set, a file is memory-mapped instead of being read into memory. Then `read_bytes()` and
+        `peek_bytes()` return zero-copy views into the mapping, unless a copy is explicitly requested. The same
+        applies if `data` is a `memoryview`.
 
-    def __init__(self, data: bytes | bytearray | Path):
+        If `lazy` is set, containers that support it (e.g. `ChunkContainer`) only record where their elements are
+        located and decode them on first access. The reader is then kept alive by these containers.
+        """
         if isinstance(data, Path):
-            self._buf = data.read_bytes()
+            self._buf = _map_file(data) if use_mmap else data.read_bytes()
         else:
             self._buf = data
         self._pos = 0
         self._stringtable = None
+        self.lazy = lazy
 
     def position(self) -> int:
         return self._pos
@@ -54,10 +149,11 @@ class BinaryReader:
     def remaining(self) -> int:
         return len(self._buf) - self._pos
 
-    def read_bytes(self, num: int) -> bytes:
+    def read_bytes(self, num: int, copy: bool = False) -> bytes | memoryview:
         pos = self._pos
         self._pos += num
-        return self._buf[pos : pos + num]
+        data = self._buf[pos : pos + num]
+        return bytes(data) if copy else data
 
     def expect_bytes(self, expected: bytes) -> bool:
         if self.remaining() < len(expected):
@@ -69,45 +165,54 @@ class BinaryReader:
 
         return True
 
-    def peek_bytes(self, num: int, offset: int = 0) -> bytes:
+    def peek_bytes(self, num: int, offset: int = 0, copy: bool = False) -> bytes | memoryview:
         at = self._pos + offset
-        return self._buf[at : at + num]
+        data = self._buf[at : at + num]
+        return bytes(data) if copy else data
 
     def read_bool(self) -> bool:
         return self.read_u8() & 0xFF == 1
 
     def read_char(self) -> bytes:
-        return self._unpack_single('<c', 1)
+        return self._unpack_single(_CHAR)
 
     def read_u8(self) -> int:
-        return self._unpack_single('<B', 1)
+        pos = self._pos
+        self._pos = pos + 1
+        return _unpack_u8(self._buf, pos)[0]
 
     def read_u16(self) -> int:
-        return self._unpack_single('<H', 2)
+        pos = self._pos
+        self._pos = pos + 2
+        return _unpack_u16(self._buf, pos)[0]
 
     def read_u32(self) -> int:
-        return self._unpack_single('<I', 4)
+        pos = self._pos
+        self._pos = pos + 4
+        return _unpack_u32(self._buf, pos)[0]
 
     def read_u64(self) -> int:
-        return self._unpack_single('<Q', 8)
+        return self._unpack_single(_U64)
 
     def read_i8(self) -> int:
-        return self._unpack_single('<b', 1)
+        return self._unpack_single(_I8)
 
     def read_i16(self) -> int:
-        return self._unpack_single('<h', 2)
+        return self._unpack_single(_I16)
 
     def read_i32(self) -> int:
-        return self._unpack_single('<i', 4)
+        return self._unpack_single(_I32)
 
     def read_i64(self) -> int:
-        return self._unpack_single('<q', 8)
+        return self._unpack_single(_I64)
 
     def read_float(self) -> float:
-        return self._unpack_single('<f', 4)
+        pos = self._pos
+        self._pos = pos + 4
+        return _unpack_float(self._buf, pos)[0]
 
     def read_str(self, length: int) -> str:
-        return self.read_bytes(length).decode(_ENCODING)
+        return str(self.read_bytes(length), _ENCODING)
 
     def read_str_u16(self) -> str:
         return self.read_str(self.read_u16())
@@ -116,19 +221,71 @@ class BinaryReader:
         return self.read_str(self.read_u32())
 
     def read_vec2(self) -> 'bCVector2':
-        return bCVector2(*self._unpack('<ff', 8))
+        pos = self._pos
+        self._pos = pos + 8
+        return bCVector2(*_unpack_vec2(self._buf, pos))
 
     def read_vec3(self) -> 'bCVector':
-        return bCVector(*self._unpack('<fff', 12))
+        pos = self._pos
+        self._pos = pos + 12
+        return bCVector(*_unpack_vec3(self._buf, pos))
 
     def read_vec4(self) -> 'bCVector4':
-        return bCVector4(*self._unpack('<ffff', 16))
+        pos = self._pos
+        self._pos = pos + 16
+        return bCVector4(*_unpack_vec4(self._buf, pos))
 
     def read_quat(self) -> 'bCQuaternion':
-        return bCQuaternion(*self._unpack('<ffff', 16))
+        pos = self._pos
+        self._pos = pos + 16
+        return bCQuaternion(*_unpack_vec4(self._buf, pos))
 
     def read_guid(self) -> bytes:
-        return self.read_bytes(20)
+        return self.read_bytes(20, copy=True)
+
+    def read_array(self, dtype: str, count: int, copy: bool = False) -> 'array.array | np.ndarray':
+        """
+        Read `count` consecutive values of the struct format character `dtype` (e.g. 'I' or 'f') in one go.
+
+        Returns a NumPy array if NumPy is available (a read-only view into the buffer, unless `copy` is set),
+        otherwise an array.array.
+        """
+        data = self.read_bytes(count * _array_item_size(dtype))
+        if np is not None:
+            values = np.frombuffer(data, dtype='<' + dtype, count=count)
+            return values.copy() if copy else values
+
+        values = array.array(dtype)
+        values.frombytes(data)
+        if _NEEDS_BYTESWAP:
+            values.byteswap()
+        return values
+
+    def read_interleaved(
+        self, count: int, fields: Sequence[InterleavedField]
+    ) -> 'list[array.array] | list[np.ndarray]':
+        """
+        Read `count` records consisting of the given fields, and split them into one contiguous array per field.
+
+        For example fields [('I', 1), ('f', 3)] read records of an u32 followed by three floats, and return an array
+        with `count` integers and an array with 3 * `count` floats. The arrays are of the same type as returned by
+        `read_array()`.
+        """
+        data = self.read_bytes(count * _interleaved_stride(fields))
+        if np is not None:
+            records = np.frombuffer(data, dtype=_interleaved_record(fields), count=count)
+            return [np.ascontiguousarray(records[f'f{i}']).reshape(-1) for i in range(len(fields))]
+
+        columns = []
+        for (dtype, _), (source, stride, num) in zip(fields, _interleaved_views(memoryview(data), fields), strict=True):
+            values = array.array(dtype, bytes(count * num * source.itemsize))
+            target = memoryview(values)
+            for component in range(num):
+                target[component::num] = source[component::stride]
+            if _NEEDS_BYTESWAP:
+                values.byteswap()
+            columns.append(values)
+        return columns
 
     def read(self, class_type: type[TBinarySerializable], size: Optional[int] = None) -> TBinarySerializable:
         value = class_type.__new__(class_type)
@@ -184,15 +341,13 @@ class BinaryReader:
         yield
         self.seek(save_pos)
 
-    def _unpack(self, fmt: str, num: int) -> Any:
-        assert num == struct.calcsize(fmt)
-
+    def _unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
         pos = self._pos
-        self._pos += num
-        return struct.unpack_from(fmt, self._buf, pos)
+        self._pos = pos + fmt.size
+        return fmt.unpack_from(self._buf, pos)
 
-    def _unpack_single(self, fmt: str, num: int) -> Any:
-        return self._unpack(fmt, num)[0]
+    def _unpack_single(self, fmt: struct.Struct) -> Any:
+        return self._unpack(fmt)[0]
 
     def __str__(self) -> str:
         pos = self.position()
@@ -210,69 +365,120 @@ class BinaryReader:
 class BinaryWriter:
     _buf: bytearray
     _pos: int
+    _size: int
     _stringtable: dict[str, int]
 
-    def __init__(self):
-        self._buf = bytearray()
+    def __init__(self, capacity: int = 0):
+        """
+        Create a writer, whose buffer has room for `capacity` bytes before it has to grow.
+
+        The buffer is allocated ahead of the written data and grows geometrically, the primitives are packed directly
+        into it instead of being packed into temporary bytes objects first.
+        """
+        self._buf = bytearray(capacity)
         self._pos = 0
+        self._size = 0
         self._stringtable = {}
 
     def buf(self) -> bytearray:
+        """Return the written bytes, this trims the unused capacity of the buffer."""
+        del self._buf[self.size() :]
         return self._buf
 
     def position(self) -> int:
         return self._pos
 
     def seek(self, pos: int) -> None:
+        # The end of the written data is only tracked when moving backwards, to keep it out of the write paths.
+        self._size = max(self._size, self._pos)
         self._pos = pos
 
     def skip(self, num: int) -> None:
-        self._pos += num
+        self._reserve(num)
 
     def size(self) -> int:
-        return len(self._buf)
+        return max(self._size, self._pos)
 
-    def write_bytes(self, val: bytes):
+    def _make_room(self, num: int) -> int:
+        """Make room for `num` bytes at the current position, and return the position in the buffer to write them to."""
+        # Geometric growth, so that appending has amortized constant cost.
+        end = self._pos + num
+        self._buf.extend(bytes(max(end, 2 * len(self._buf), 256) - len(self._buf)))
+        return self._pos
+
+    def _reserve(self, num: int) -> int:
+        """Advance the position by `num` bytes, and return the position in the buffer to write them to."""
         pos = self._pos
-        self._pos += len(val)
+        if pos + num > len(self._buf):
+            pos = self._make_room(num)
+        self._pos = pos + num
+        return pos
 
-        if pos == len(self._buf):
-            self._buf.extend(val)
-        else:
-            self._buf[pos : pos + len(val)] = val
+    def _pack(self, packer: struct.Struct, *vals) -> None:
+        pos = self._reserve(packer.size)
+        packer.pack_into(self._buf, pos, *vals)
+
+    def write_bytes(self, val: bytes):
+        num = len(val)
+        pos = self._reserve(num)
+        self._buf[pos : pos + num] = val
 
     def write_bool(self, val: bool) -> None:
         self.write_u8(1 if val else 0)
 
     def write_char(self, val: bytes) -> None:
-        self._pack('<c', 1, val)
+        self._pack(_CHAR, val)
+
+    # The hot paths (vertices, key frames, chunk headers) inline _reserve(), which saves a method call per value.
 
     def write_u8(self, val: int) -> None:
-        self._pack('<B', 1, val)
+        pos = self._pos
+        if pos + 1 > len(self._buf):
+            pos = self._make_room(1)
+        self._pos = pos + 1
+        _pack_u8(self._buf, pos, val)
 
     def write_u16(self, val: int) -> None:
-        self._pack('<H', 2, val)
+        pos = self._pos
+        if pos + 2 > len(self._buf):
+            pos = self._make_room(2)
+        self._pos = pos + 2
+        _pack_u16(self._buf, pos, val)
 
     def write_u32(self, val: int) -> None:
-        self._pack('<I', 4, val)
+        pos = self._pos
+        if pos + 4 > len(self._buf):
+            pos = self._make_room(4)
+        self._pos = pos + 4
+        _pack_u32(self._buf, pos, val)
 
     def write_u64(self, val: int) -> None:
-        self._pack('<Q', 8, val)
+        self._pack(_U64, val)
 
     def write_i8(self, val: int) -> None:
-        self._pack('<b', 1, val)
+        self._pack(_I8, val)
 
     def write_i16(self, val: int) -> None:
-        self._pack('<h', 2, val)
+        self._pack(_I16, val)
 
     def write_i32(self, val: int) -> None:
-        self._pack('<i', 4, val)
+        self._pack(_I32, val)
 
     def write_i64(self, val: int) -> None:
-        self._pack('<q', 8, val)
+        self._pack(_I64, val)
 
     def write_float(self, val: float) -> None:
-        self._pack('<f', 4, val)
+        pos = self._pos
+        if pos + 4 > len(self._buf):
+            pos = self._make_room(4)
+        self._pos = pos + 4
+        _pack_float(self._buf, pos, val)
+
+    def patch_u32(self, pos: int, val: int) -> None:
+        """Overwrite an already written u32 at `pos` (e.g. a size placeholder), without moving the position."""
+        if pos < 0 or pos + 4 > self.size():
+            raise ValueError(f'Cannot patch at {pos:#x}, only {self.size():#x} bytes have been written.')
+        _pack_u32(self._buf, pos, val)
 
     def write_str_u16(self, val: str) -> None:
         val_bytes = val.encode(_ENCODING)
@@ -285,16 +491,70 @@ class BinaryWriter:
         self.write_bytes(val_bytes)
 
     def write_vec2(self, val: 'bCVector2') -> None:
-        return self._pack('<ff', 8, val.x, val.y)
+        pos = self._pos
+        if pos + 8 > len(self._buf):
+            pos = self._make_room(8)
+        self._pos = pos + 8
+        _pack_vec2(self._buf, pos, val.x, val.y)
 
     def write_vec3(self, val: 'bCVector') -> None:
-        return self._pack('<fff', 12, val.x, val.y, val.z)
+        pos = self._pos
+        if pos + 12 > len(self._buf):
+            pos = self._make_room(12)
+        self._pos = pos + 12
+        _pack_vec3(self._buf, pos, val.x, val.y, val.z)
 
     def write_vec4(self, val: 'bCVector4') -> None:
-        return self._pack('<ffff', 16, val.x, val.y, val.z, val.w)
+        pos = self._pos
+        if pos + 16 > len(self._buf):
+            pos = self._make_room(16)
+        self._pos = pos + 16
+        _pack_vec4(self._buf, pos, val.x, val.y, val.z, val.w)
 
     def write_quat(self, val: 'bCQuaternion') -> None:
-        return self._pack('<ffff', 16, val.x, val.y, val.z, val.w)
+        pos = self._pos
+        if pos + 16 > len(self._buf):
+            pos = self._make_room(16)
+        self._pos = pos + 16
+        _pack_vec4(self._buf, pos, val.x, val.y, val.z, val.w)
+
+    def write_array(self, values: 'array.array | np.ndarray | Iterable', dtype: str) -> None:
+        """Write all values as consecutive values of the struct format character `dtype` in one go."""
+        if np is not None and isinstance(values, np.ndarray):
+            self.write_bytes(values.astype('<' + dtype, copy=False).tobytes())
+            return
+
+        if not isinstance(values, array.array) or values.typecode != dtype:
+            values = array.array(dtype, values)
+        if _NEEDS_BYTESWAP:
+            values = array.array(dtype, values)
+            values.byteswap()
+        self.write_bytes(values.tobytes())
+
+    def write_interleaved(
+        self, count: int, fields: Sequence[InterleavedField], columns: 'Sequence[array.array | np.ndarray | Iterable]'
+    ) -> None:
+        """Inverse of `BinaryReader.read_interleaved()`, write `count` records built from one array per field."""
+        if np is not None:
+            records = np.empty(count, dtype=_interleaved_record(fields))
+            for i, ((_, num), column) in enumerate(zip(fields, columns, strict=True)):
+                records[f'f{i}'] = np.asarray(column).reshape(count, num)
+            self.write_bytes(records.tobytes())
+            return
+
+        data = bytearray(count * _interleaved_stride(fields))
+        views = _interleaved_views(memoryview(data), fields)
+        for (dtype, _), (target, stride, num), column in zip(fields, views, columns, strict=True):
+            values = (
+                column if isinstance(column, array.array) and column.typecode == dtype else array.array(dtype, column)
+            )
+            if _NEEDS_BYTESWAP:
+                values = array.array(dtype, values)
+                values.byteswap()
+            source = memoryview(values)
+            for component in range(num):
+                target[component::stride] = source[component::num]
+        self.write_bytes(data)
 
     def write(self, value: TBinarySerializable) -> None:
         value.write(self)
@@ -347,13 +607,9 @@ class BinaryWriter:
         yield save_pos
         self.seek(save_pos)
 
-    def _pack(self, fmt: str, num: int, *args) -> None:
-        assert num == struct.calcsize(fmt)
-        self.write_bytes(struct.pack(fmt, *args))
-
     def peek_bytes(self, num: int, offset: int = 0) -> bytes:
         at = self._pos + offset
-        return self._buf[at : at + num]
+        return self._buf[at : min(at + num, self.size())]
 
     def __str__(self) -> str:
         pos = self.position()
@@ -368,5 +624,106 @@ class BinaryWriter:
         return str(self)
 
 
+class StreamBinaryWriter(BinaryWriter):
+    """
+    Writer that streams to a seekable binary file, only a bounded window of the output is kept in memory.
+
+    Positions are file offsets, as for `BinaryWriter`. Writing at positions that have already been streamed to the
+    file (e.g. size fixups via `patch_u32()` or `at_position()`) goes directly to the file. Call `flush()` when done.
+    """
+
+    _file: BinaryIO
+    _window: int
+    # File offset of the start of the buffer, _pos and _size are relative to it.
+    _base: int
+    # End of the data that has been streamed to the file.
+    _end: int
+
+    def __init__(self, file: BinaryIO, window: int = 1 << 20):
+        super().__init__(window)
+        self._file = file
+        self._window = window
+        self._base = file.tell()
+        self._end = self._base
+
+    def buf(self) -> bytearray:
+        raise NotImplementedError('The written bytes have been streamed to the file.')
+
+    def position(self) -> int:
+        return self._base + self._pos
+
+    def seek(self, pos: int) -> None:
+        self._size = max(self._size, self._pos)
+        if 0 <= pos - self._base <= self._size:
+            self._pos = pos - self._base
+            return
+
+        self.flush()
+        self._file.seek(pos)
+        self._base = pos
+
+    def size(self) -> int:
+        return max(self._end, self._base + max(self._size, self._pos))
+
+    def flush(self) -> None:
+        """Write the buffered data to the file, the position is retained."""
+        pos = self.position()
+        num = max(self._size, self._pos)
+        self._file.write(memoryview(self._buf)[:num])
+        self._end = max(self._end, self._base + num)
+        self._base += num
+        if pos != self._base:
+            self._file.seek(pos)
+            self._base = pos
+        self._buf = bytearray(self._window)
+        self._pos = 0
+        self._size = 0
+
+    def _make_room(self, num: int) -> int:
+        pos = self._pos
+        if pos > 0:
+            # Stream everything before the current position to the file, keep the rest (if we moved backwards).
+            self._file.write(memoryview(self._buf)[:pos])
+            self._base += pos
+            self._end = max(self._end, self._base)
+            rest = self._buf[pos : max(self._size, pos)]
+            self._buf = bytearray(max(self._window, len(rest)))
+            self._buf[: len(rest)] = rest
+            self._pos = 0
+            self._size = len(rest)
+
+        if num > len(self._buf):
+            self._buf.extend(bytes(num - len(self._buf)))
+        return self._pos
+
+    def write_bytes(self, val: bytes):
+        if len(val) >= self._window and self._pos >= self._size:
+            # Large blocks (e.g. vertex arrays) bypass the window, unless they overwrite buffered data.
+            self.flush()
+            self._file.write(val)
+            self._base += len(val)
+            self._end = max(self._end, self._base)
+            return
+        super().write_bytes(val)
+
+    def patch_u32(self, pos: int, val: int) -> None:
+        if pos < 0 or pos + 4 > self.size():
+            raise ValueError(f'Cannot patch at {pos:#x}, only {self.size():#x} bytes have been written.')
+
+        if pos < self._base:
+            if pos + 4 > self._base:
+                self.flush()
+            self._file.seek(pos)
+            self._file.write(_U32.pack(val))
+            self._file.seek(self._base)
+            return
+
+        _pack_u32(self._buf, pos - self._base, val)
+
+    def peek_bytes(self, num: int, offset: int = 0) -> bytes:
+        at = max(self._pos + offset, 0)
+        return self._buf[at : min(at + num, max(self._size, self._pos))]
+
+
 from .property_types import bCVector, bCVector2  # noqa: E402 Use tail import to resolve circular import of binary
 from .types import bCQuaternion, bCVector4  # noqa: E402 Use tail import to resolve circular import of binary
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from collections import OrderedDict
+from functools import cache
+from pathlib import Path
+from typing import Optional
+
+from .. import log as logging
+from . import genome_file
+from .binary import TBinarySerializable
+
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = '.pickle'
+
+
+@cache
+def _code_version() -> str:
+    """Hash of the sources of the io package, so that entries pickled by a different parser version are never used."""
+    package = Path(__file__).parent
+    digest = hashlib.sha256()
+    for path in sorted(package.rglob('*.py')):
+        digest.update(path.relative_to(package).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _cache_key(file: Path, content_type: type, allow_fallback: bool) -> str:
+    stat = file.stat()
+    identity = '|'.join(
+        (
+            _code_version(),
+            str(file.resolve()),
+            str(stat.st_mtime_ns),
+            str(stat.st_size),
+            f'{content_type.__module__}.{content_type.__qualname__}',
+            str(allow_fallback),
+        )
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class ParseCache:
+    """
+    Cache for parsed Genome files, with an in-memory and an on-disk level.
+
+    Entries are keyed by path, modification time and size of the file, and by a hash of the parser sources, so a
+    modified file, or a file cached by another parser version, is parsed again. Both levels store the pickled
+    contents, and evict the least recently used entries once their size budget is exceeded.
+    Each read returns a new object, so callers are free to modify it.
+    """
+
+    def __init__(self, memory_budget: int = 256 << 20, disk_budget: int = 512 << 20, directory: Optional[Path] = None):
+        """Create a cache, a budget of zero disables the corresponding level (the disk cache is in a temp directory)."""
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.directory = directory if directory is not None else Path(tempfile.gettempdir()) / 'g3blend-cache'
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+
+    def read(
+        self, file: Path, content_type: type[TBinarySerializable], allow_fallback: bool = False
+    ) -> TBinarySerializable:
+        file = Path(file)
+        key = _cache_key(file, content_type, allow_fallback)
+
+        data = self._get(key)
+        if data is not None:
+            try:
+                return pickle.loads(data)  # noqa: S301
+            except Exception as e:  # noqa: BLE001
+                logger.warning('Discarding corrupt cache entry for {}: {}', file, e)
+                self._discard(key)
+
+        # Cached contents must not reference the file, thus no memory mapping.
+        content = genome_file.read_file(file, content_type, allow_fallback)
+        try:
+            data = pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError) as e:
+            logger.warning('Cannot cache {}: {}', file, e)
+        else:
+            self._put(key, data)
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            directory = self._disk_directory()
+            if directory is not None:
+                for path in directory.glob(f'*{_SUFFIX}'):
+                    path.unlink(missing_ok=True)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+
+            data = self._disk_get(key)
+            if data is not None:
+                self._memory_put(key, data)
+            return data
+
+    def _put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._memory_put(key, data)
+            self._disk_put(key, data)
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory_size -= len(data)
+            directory = self._disk_directory()
+            if directory is not None:
+                (directory / f'{key}{_SUFFIX}').unlink(missing_ok=True)
+
+    def _memory_put(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_budget:
+            return
+
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = data
+        self._memory_size += len(data)
+
+        while self._memory_size > self.memory_budget:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _disk_directory(self) -> Optional[Path]:
+        if self.disk_budget <= 0:
+            return None
+
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        except OSError:
+            return None
+
+        # Pickles must only be loaded from a directory that no one else can write to.
+        if hasattr(os, 'getuid') and self.directory.stat().st_uid != os.getuid():
+            return None
+        return self.directory
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        directory = self._disk_directory()
+        if directory is None:
+            return None
+
+        path = directory / f'{key}{_SUFFIX}'
+        try:
+            data = path.read_bytes()
+            # The modification time tracks the last use for the LRU eviction.
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        directory = self._disk_directory()
+        if directory is None or len(data) > self.disk_budget:
+            return
+
+        tmp_path = None
+        try:
+            # Write to a temporary file first, so that concurrent readers never see a partial entry.
+            fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            tmp_path = Path(tmp_name)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            tmp_path.replace(directory / f'{key}{_SUFFIX}')
+        except OSError as e:
+            logger.warning('Failed to write cache entry: {}', e)
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict_disk(directory)
+
+    def _evict_disk(self, directory: Path) -> None:
+        entries = []
+        for path in directory.glob(f'*{_SUFFIX}'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.disk_budget:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+
+default_cache = ParseCache()
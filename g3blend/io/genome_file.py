@@ -1,8 +1,21 @@
+import multiprocessing
+import pickle
+
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+from .. import log as logging
 from .binary import BinaryReader, BinaryWriter, TBinarySerializable
 from .property_sets.property_set import PropertySet
 from .property_sets.util import read_property_set, write_property_set
 
 
+logger = logging.getLogger(__name__)
+
 _GENOME_MAGIC = b'\x47\x45\x4e\x4f\x4d\x46\x4c\x45'
 _DEADBEEF = b'\xef\xbe\xad\xde'
 _VERSION = 1
@@ -20,9 +33,46 @@ def _read_content(reader: BinaryReader, content_type: type[TBinarySerializable])
 def read(
     reader: BinaryReader, content_type: type[TBinarySerializable], allow_fallback: bool = False
 ) -> TBinarySerializable:
+    read_header(reader, allow_fallback)
+    return _read_content(reader, content_type)
+
+
+def read_file(
+    file: Path, content_type: type[TBinarySerializable], allow_fallback: bool = False, use_mmap: bool = False
+) -> TBinarySerializable:
+    return read(BinaryReader(Path(file), use_mmap), content_type, allow_fallback)
+
+
+def read_files(
+    files: Iterable[Path],
+    content_type: type[TBinarySerializable],
+    allow_fallback: bool = False,
+    max_workers: Optional[int] = None,
+) -> list[TBinarySerializable]:
+    """
+    Read multiple files in parallel worker processes, the results are in the same order as the files.
+
+    The parsed contents are pickled back to the calling process, so they must not reference a memory-mapped reader
+    (no mmap, no lazy chunks). If the worker processes cannot be used, e.g. because the embedding application does
+    not support spawning Python processes, the files are read sequentially in the calling process instead.
+    """
+    files = [Path(file) for file in files]
+    read_one = partial(read_file, content_type=content_type, allow_fallback=allow_fallback)
+    if len(files) > 1 and max_workers != 1:
+        try:
+            # Spawn instead of fork, forking a multithreaded host application (i.e. Blender) is not safe.
+            with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                return list(executor.map(read_one, files))
+        except (BrokenProcessPool, ImportError, OSError, pickle.PicklingError) as e:
+            logger.warning('Parallel read failed, reading sequentially instead: {}', e)
+    return [read_one(file) for file in files]
+
+
+def read_header(reader: BinaryReader, allow_fallback: bool = False) -> None:
+    """Read the header and the stringtable, and leave the reader positioned at the start of the content."""
     if not reader.expect_bytes(_GENOME_MAGIC):
         if allow_fallback:
-            return _read_content(reader, content_type)
+            return
         raise ValueError('Not a valid Genome file.')
 
     if (version := reader.read_u16()) != _VERSION:
@@ -36,8 +86,6 @@ def read(
 
         reader.read_stringtable()
 
-    return _read_content(reader, content_type)
-
 
 def write(writer: BinaryWriter, content: TBinarySerializable) -> None:
     writer.write_bytes(_GENOME_MAGIC)
@@ -53,7 +101,6 @@ def write(writer: BinaryWriter, content: TBinarySerializable) -> None:
 
     deadbeef_offset = writer.position()
     writer.write_bytes(_DEADBEEF)
-    with writer.at_position(size_fixup_pos):
-        writer.write_u32(deadbeef_offset)
+    writer.patch_u32(size_fixup_pos, deadbeef_offset)
 
     writer.write_stringtable()
@@ -26,8 +26,7 @@ class Property(BinarySerializable, Generic[TPropertyType]):
         size_offset = writer.position()
         writer.write_u32(0)
         writer.write(self.value)
-        with writer.at_position(size_offset) as pos:
-            writer.write_u32(pos - size_offset - 4)
+        writer.patch_u32(size_offset, writer.position() - size_offset - 4)
 
     def __str__(self) -> str:
         return f'{self.type} {self.name} = {self.value}'
@@ -54,8 +54,7 @@ class PropertySet(BinarySerializable):
         writer.write_u16(self.version)
         self.write_post_version(writer)
 
-        with writer.at_position(size_offset) as pos:
-            writer.write_u32(pos - size_offset - 4)
+        writer.patch_u32(size_offset, writer.position() - size_offset - 4)
 
     def write_pre_version(self, writer: BinaryWriter):
         pass
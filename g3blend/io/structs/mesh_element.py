@@ -1,5 +1,7 @@
-from collections.abc import Callable
-from dataclasses import dataclass, field
+import array
+
+from collections.abc import Callable, Sequence
+from dataclasses import astuple, dataclass, field
 from enum import IntEnum
 from typing import ClassVar, Generic, Optional, TypeVar
 
@@ -226,81 +228,143 @@ _vertex_stream_to_struct_map = {
 TVetexArrayType = TypeVar('TVetexArrayType')
 
 
+def _data_equal(a: 'Sequence[int] | Sequence[float]', b: 'Sequence[int] | Sequence[float]') -> bool:
+    if len(a) != len(b):
+        return False
+    try:
+        # Arrays (array.array and NumPy) of the same type compare by their raw bytes.
+        return memoryview(a).cast('B') == memoryview(b).cast('B')
+    except TypeError:
+        # Not a (contiguous) buffer, e.g. a list.
+        return all(x == y for x, y in zip(a, b, strict=True))
+
+
 @dataclass(slots=True)
 class eCVertexStructArrayBase(BinarySerializable, Generic[TVetexArrayType]):
-    read_element: ClassVar[Callable[[BinaryReader], TVetexArrayType]]
-    write_element: ClassVar[Callable[[BinaryWriter, TVetexArrayType], None]]
+    struct_type: ClassVar[eEVertexTypeStruct]
+    # Struct format character and number of components of an element, the elements of a stream are stored as a
+    # single flat array of them (a read-only view into the read buffer if NumPy is available).
+    array_type: ClassVar[str]
+    components: ClassVar[int] = 1
+    # Element type of multi-component streams, which is created from the components.
+    element_type: ClassVar[Optional[Callable[..., TVetexArrayType]]] = None
 
     vertex_stream_type: eEVertexStreamArrayType
-    elements: list[TVetexArrayType] = field(default_factory=list)
+    data: 'Sequence[int] | Sequence[float]' = field(default_factory=list, compare=False)
+    version: int = 1
+
+    # Mutable, thus not hashable (as with the generated __eq__).
+    __hash__ = None
+
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ cannot compare NumPy arrays, subclasses are declared with eq=False to keep this one.
+        if type(other) is not type(self):
+            return NotImplemented
+        return (
+            self.vertex_stream_type == other.vertex_stream_type
+            and self.version == other.version
+            and _data_equal(self.data, other.data)
+        )
 
     def read(self, reader: BinaryReader):
-        reader.skip(2)
-        self.elements = reader.read_prefixed_list(read=self.__class__.read_element)
+        self.version = reader.read_u16()
+        # bTArray writes a useless byte during serialization.
+        reader.skip(1)
+        self.data = reader.read_array(self.array_type, reader.read_u32() * self.components)
 
     def write(self, writer: BinaryWriter):
-        writer.write_u16(1)
-        writer.write_prefixed_list(self.elements, write=self.__class__.write_element)
+        writer.write_u16(self.version)
+        writer.write_u8(1)
+        writer.write_u32(self.num_elements())
+        writer.write_array(self.data, self.array_type)
 
+    def num_elements(self) -> int:
+        return len(self.data) // self.components
 
-@dataclass(slots=True)
+    @property
+    def elements(self) -> 'Sequence[TVetexArrayType]':
+        """The elements of the stream, multi-component elements are created on each access (prefer `data`)."""
+        if self.element_type is None:
+            return self.data
+
+        # Arrays (array.array and NumPy) convert to Python numbers at once, other sequences (e.g. list) as they are.
+        values = self.data.tolist() if hasattr(self.data, 'tolist') else list(self.data)
+        num = self.components
+        return [self.element_type(*values[i : i + num]) for i in range(0, len(values), num)]
+
+    @elements.setter
+    def elements(self, elements: 'Sequence[TVetexArrayType]') -> None:
+        if self.element_type is not None:
+            elements = (component for element in elements for component in astuple(element))
+        self.data = array.array(self.array_type, elements)
+
+
+@dataclass(slots=True, eq=False)
 class eCVertexStructArray_GEFloat(eCVertexStructArrayBase[float]):
     struct_type = eEVertexTypeStruct.GEFloat
-    read_element = BinaryReader.read_float
-    write_element = BinaryWriter.write_float
+    array_type = 'f'
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class eCVertexStructArray_GEU16(eCVertexStructArrayBase[int]):
     struct_type = eEVertexTypeStruct.GEU16
-    read_element = BinaryReader.read_u16
-    write_element = BinaryWriter.write_u16
+    array_type = 'H'
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class eCVertexStructArray_GEU32(eCVertexStructArrayBase[int]):
     struct_type = eEVertexTypeStruct.GEU32
-    read_element = BinaryReader.read_u32
-    write_element = BinaryWriter.write_u32
+    array_type = 'I'
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class eCVertexStructArray_bCVector2(eCVertexStructArrayBase[bCVector2]):
     struct_type = eEVertexTypeStruct.bCVector2
-    read_element = BinaryReader.read_vec2
-    write_element = BinaryWriter.write_vec2
+    array_type = 'f'
+    components = 2
+    element_type = bCVector2
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class eCVertexStructArray_bCVector3(eCVertexStructArrayBase[bCVector]):
     struct_type = eEVertexTypeStruct.bCVector3
-    read_element = BinaryReader.read_vec3
-    write_element = BinaryWriter.write_vec3
+    array_type = 'f'
+    components = 3
+    element_type = bCVector
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class eCVertexStructArray_bCVector4(eCVertexStructArrayBase[bCVector4]):
     struct_type = eEVertexTypeStruct.bCVector4
-    read_element = BinaryReader.read_vec4
-    write_element = BinaryWriter.write_vec4
+    array_type = 'f'
+    components = 4
+    element_type = bCVector4
+
+
+_vertex_struct_array_types = {
+    array_type.struct_type: array_type
+    for array_type in (
+        eCVertexStructArray_bCVector2,
+        eCVertexStructArray_bCVector3,
+        eCVertexStructArray_bCVector4,
+        eCVertexStructArray_GEU16,
+        eCVertexStructArray_GEU32,
+        eCVertexStructArray_GEFloat,
+    )
+}
+
+# Dispatch table from stream type to the class of its stream array.
+_vertex_stream_array_types = {
+    stream_type: _vertex_struct_array_types[fvf.vertex_type_struct]
+    for stream_type, fvf in _vertex_stream_to_struct_map.items()
+}
 
 
 def create_vertex_struct_array(vertex_stream_type: eEVertexStreamArrayType) -> eCVertexStructArrayBase:
-    match _vertex_stream_to_struct_map[vertex_stream_type].vertex_type_struct:
-        case eEVertexTypeStruct.bCVector2:
-            return eCVertexStructArray_bCVector2(vertex_stream_type)
-        case eEVertexTypeStruct.bCVector3:
-            return eCVertexStructArray_bCVector3(vertex_stream_type)
-        case eEVertexTypeStruct.bCVector4:
-            return eCVertexStructArray_bCVector4(vertex_stream_type)
-        case eEVertexTypeStruct.GEU16:
-            return eCVertexStructArray_GEU16(vertex_stream_type)
-        case eEVertexTypeStruct.GEU32:
-            return eCVertexStructArray_GEU32(vertex_stream_type)
-        case eEVertexTypeStruct.GEFloat:
-            return eCVertexStructArray_GEFloat(vertex_stream_type)
-        case _:
-            raise ValueError('Unsupported vertex stream array.')
+    array_type = _vertex_stream_array_types.get(vertex_stream_type)
+    if array_type is None:
+        raise ValueError('Unsupported vertex stream array.')
+    return array_type(vertex_stream_type)
 
 
 @dataclass(slots=True)
@@ -311,6 +375,17 @@ class eCMeshElement(BinarySerializable):
     size: int
     material_name: str
     stream_arrays: list[eCVertexStructArrayBase]
+    # Raw bytes of the sections following the stream arrays (index and lightmap UV groups...), they are not
+    # interpreted, but have to match the version when writing.
+    trailing_data: bytes = b''
+    # Stream type -> stream array (the first one, if a type occurs multiple times), see add_stream_array().
+    _stream_index: dict[eEVertexStreamArrayType, eCVertexStructArrayBase] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for stream_array in self.stream_arrays:
+            self._stream_index.setdefault(stream_array.vertex_stream_type, stream_array)
 
     def read(self, reader: BinaryReader):
         self.version = reader.read_u16()
@@ -321,12 +396,14 @@ class eCMeshElement(BinarySerializable):
 
         stream_array_count = reader.read_u32()
         self.stream_arrays = []
+        self._stream_index = {}
         for _ in range(stream_array_count):
             stream_array_type = eEVertexStreamArrayType(reader.read_u32())
             vertex_array = create_vertex_struct_array(stream_array_type)
             vertex_array.read(reader)
-            self.stream_arrays.append(vertex_array)
+            self.add_stream_array(vertex_array)
 
+        trailing_offset = reader.position()
         if self.version >= 3:
             reader.skip(1)  # true
             reader.skip(reader.read_u32() * 4)
@@ -352,11 +429,39 @@ class eCMeshElement(BinarySerializable):
             reader.skip(1)
             reader.skip(reader.read_u32() * 4)
 
+        trailing_size = reader.position() - trailing_offset
+        reader.seek(trailing_offset)
+        self.trailing_data = reader.read_bytes(trailing_size, copy=True)
+
     def write(self, writer: BinaryWriter):
-        raise NotImplementedError
+        writer.write_u16(self.version)
+        writer.write_u32(self.fvf)
+        writer.write(self.bounding_box)
+        writer.write_u32(self.size)
+        writer.write_entry(self.material_name)
 
-    def has_stream_array(self, stream_type: eEVertexStreamArrayType) -> bool:
-        return any(a.vertex_stream_type == stream_type for a in self.stream_arrays)
+        writer.write_u32(len(self.stream_arrays))
+        for vertex_array in self.stream_arrays:
+            writer.write_u32(vertex_array.vertex_stream_type)
+            vertex_array.write(writer)
+
+        writer.write_bytes(self.trailing_data)
 
-    def get_stream_array_by_type(self, stream_type: eEVertexStreamArrayType) -> Optional[list[TVetexArrayType]]:
-        return next((a.elements for a in self.stream_arrays if a.vertex_stream_type == stream_type), None)
+    def add_stream_array(self, stream_array: eCVertexStructArrayBase) -> None:
+        """Append a stream array, stream_arrays has to be modified through this, to keep the lookup up to date."""
+        self.stream_arrays.append(stream_array)
+        self._stream_index.setdefault(stream_array.vertex_stream_type, stream_array)
+
+    def has_stream_array(self, stream_type: eEVertexStreamArrayType) -> bool:
+        return stream_type in self._stream_index
+
+    def get_stream_array_by_type(self, stream_type: eEVertexStreamArrayType) -> Optional[Sequence[TVetexArrayType]]:
+        stream_array = self._stream_index.get(stream_type)
+        return stream_array.elements if stream_array is not None else None
+
+    def get_stream_data_by_type(
+        self, stream_type: eEVertexStreamArrayType
+    ) -> 'Optional[Sequence[int] | Sequence[float]]':
+        """Flat component array of a stream, e.g. three floats per vertex for positions."""
+        stream_array = self._stream_index.get(stream_type)
+        return stream_array.data if stream_array is not None else None
@@ -9,7 +9,7 @@ class bCGuid(BinarySerializable):
     _valid: int
 
     def read(self, reader: BinaryReader) -> None:
-        self.guid = reader.read_bytes(16)
+        self.guid = reader.read_bytes(16, copy=True)
         self._valid = reader.read_u32()
 
     def write(self, writer: BinaryWriter) -> None:
@@ -1,4 +1,7 @@
 import logging
+import time
+
+from contextlib import contextmanager
 
 
 class Message:
@@ -22,3 +25,13 @@ class StyleAdapter(logging.LoggerAdapter):
 
 def getLogger(name) -> logging.Logger:  # noqa: N802
     return StyleAdapter(logging.getLogger(name))
+
+
+@contextmanager
+def timed(logger: logging.Logger, msg: str, *args, level: int = logging.DEBUG):
+    """Log the wall time spent in the block, `msg` is formatted with `args` followed by the duration in ms."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.log(level, '{} took {:.1f} ms', Message(msg, args), (time.perf_counter() - start) * 1000)
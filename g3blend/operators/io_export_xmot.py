@@ -1,21 +1,15 @@
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Optional
 
 import bpy
+import numpy as np
 
-from mathutils import Matrix, Quaternion, Vector
+from mathutils import Matrix, Vector
 
 from .. import log as logging
 from ..extension import migrate
-from ..io.animation.chunks import (
-    AnimationType,
-    InterpolationType,
-    KeyFrameChunk,
-    MotionPartChunk,
-    QuaternionKeyFrame,
-    VectorKeyFrame,
-)
+from ..io.animation.chunks import AnimationType, InterpolationType, KeyFrameChunk, MotionPartChunk
 from ..io.animation.xmot import ResourceAnimationMotion as Xmot
 from ..io.animation.xmot import eCWrapper_emfx2Motion, eSFrameEffect
 from ..io.property_types import bCDateTime
@@ -25,6 +19,12 @@ from ..util import (
     action_get_fcurves,
     bone_correction_matrix_inv,
     calc_arm_root_transformation,
+    from_blend_quat_array,
+    from_blend_vec_array,
+    keyframe_enum_identifier,
+    transform_rotation_array,
+    transform_scale_array,
+    transform_translation_array,
     write_genome_file,
 )
 
@@ -39,7 +39,8 @@ COMMONLY_USED_SLOTS = {
 }
 
 FrameKey = tuple[str, AnimationType]
-FramesPerBone = dict[FrameKey, tuple[str, list[tuple[float, Any]]]]
+# Interpolation, times (N) and values (N, num_channels) of the key frames
+FramesPerBone = dict[FrameKey, tuple[Optional[str], np.ndarray, np.ndarray]]
 
 
 def _group_frames_per_bone(arm_obj: bpy.types.Object, action: bpy.types.Action) -> FramesPerBone:
@@ -62,13 +63,13 @@ def _group_frames_per_bone(arm_obj: bpy.types.Object, action: bpy.types.Action)
 
         # TODO: Consider rotation mode of object?
         if prop_name == 'location':
-            frames = _extract_frames_from_curves(curves, 3, Vector)
+            frames = _extract_frames_from_curves(curves, 3)
             animation_type = AnimationType.Position
         elif prop_name == 'rotation_quaternion':
-            frames = _extract_frames_from_curves(curves, 4, Quaternion)
+            frames = _extract_frames_from_curves(curves, 4)
             animation_type = AnimationType.Rotation
         elif prop_name == 'scale':
-            frames = _extract_frames_from_curves(curves, 3, Vector)
+            frames = _extract_frames_from_curves(curves, 3)
             animation_type = AnimationType.Scaling
         else:
             raise ValueError(f'Unsupported property keyframe {prop_name} for bone {pose_bone.name}.')
@@ -90,8 +91,10 @@ def _group_frames_per_bone(arm_obj: bpy.types.Object, action: bpy.types.Action)
 
         # TODO: Might want to use sampling as an alternative for complex animations with constraints and stuff.
 
+    return frames_per_bone
+
 
-def _export_bone(  # noqa: PLR0915
+def _export_bone(
     motion: eCWrapper_emfx2Motion,
     pose_bone: bpy.types.PoseBone,
     frames_per_bone: FramesPerBone,
@@ -131,21 +134,12 @@ def _export_bone(  # noqa: PLR0915
     motion_part.bind_pose_rotation = _from_blend_quat(rot)
     motion_part.bind_pose_scale = _from_blend_vec(scale)
 
-    def position_value_map(v):
-        return _from_blend_vec((pre_matrix @ Matrix.Translation(v) @ post_matrix).to_translation() * root_scale_inv)
-
-    def rotation_value_map(v):
-        return _from_blend_quat((pre_matrix @ v.to_matrix().to_4x4() @ post_matrix).to_quaternion())
-
-    def scaling_value_map(v):
-        return _from_blend_vec((pre_matrix @ Matrix.LocRotScale(None, None, v) @ post_matrix).to_scale().to_3d())
-
     for animation_type in AnimationType:
         key = (pose_bone.name, animation_type)
         if key not in frames_per_bone:
             continue
 
-        interpolation, frames = frames_per_bone[key]
+        interpolation, times, values = frames_per_bone[key]
         match interpolation:
             # Linear
             case 'LINEAR':
@@ -157,38 +151,34 @@ def _export_bone(  # noqa: PLR0915
                 logger.warning('Unsupported interpolation: {}', interpolation)
                 continue
 
+        # If the pose position/rotation/scale (separately) of a bone is constant across the entire animation,
+        # there is no key frame chunk for this property. To retain the pose of such a motion part, the xmot import
+        # has to synthesize a key frame for it. Here on export we filter out these constant key frames again,
+        if len(times) < 1 or (len(times) == 1 and times[0] == 0.0):
+            continue
+
+        # The key frame values are transformed all at once. Compared to transforming each value with mathutils,
+        # which computes in single precision, the results only differ by float32 rounding (relative error < 1e-6).
         match animation_type:
             # Position
             case AnimationType.Position:
-                frame_type = VectorKeyFrame
-                value_map = position_value_map
+                positions = transform_translation_array(pre_matrix, values, post_matrix) * np.asarray(root_scale_inv)
+                xvalues = from_blend_vec_array(positions)
             # Rotation
             case AnimationType.Rotation:
-                frame_type = QuaternionKeyFrame
-                value_map = rotation_value_map
+                xvalues = from_blend_quat_array(transform_rotation_array(pre_matrix, values, post_matrix))
             # Scaling
             case AnimationType.Scaling:
-                frame_type = VectorKeyFrame
-                value_map = scaling_value_map
+                xvalues = from_blend_vec_array(transform_scale_array(pre_matrix, values, post_matrix))
             case _:
                 continue
-        # If the pose position/rotation/scale (separately) of a bone is constant across the entire animation,
-        # there is no key frame chunk for this property. To retain the pose of such a motion part, the xmot import
-        # has to synthesize a key frame for it. Here on export we filter out these constant key frames again,
-        if len(frames) < 1 or (len(frames) == 1 and frames[0][0] == 0.0):
-            continue
 
         key_frame = motion.add_chunk(KeyFrameChunk)
         key_frame.interpolation_type = interpolation_type
         key_frame.animation_type = animation_type
-        key_frame.frames = []
-
-        for time, value in frames:
-            xframe = frame_type()
-            # TODO: Proper time/FPS scaling
-            xframe.time = time / 25
-            xframe.value = value_map(value)
-            key_frame.frames.append(xframe)
+        # TODO: Proper time/FPS scaling
+        key_frame.times = (times / 25).astype(np.float32)
+        key_frame.values = xvalues.astype(np.float32).ravel()
 
 
 def _export_bones(
@@ -292,52 +282,52 @@ def save_xmot(
     context.scene.frame_set(old_scene_frame_current)
 
 
-def _extract_frames_from_curves(
-    curves: list[bpy.types.FCurve], num_channels: int, combine
-) -> Optional[tuple[str, list[tuple[float, Any]]]]:
+def _extract_frames_from_curves(  # noqa: PLR0911
+    curves: list[bpy.types.FCurve], num_channels: int
+) -> Optional[tuple[Optional[str], np.ndarray, np.ndarray]]:
     if len(curves) != num_channels:
         logger.warning('Unexpected number of curves {} vs. {}.', num_channels, len(curves))
         return None
 
-    channels = []
-    num_keyframes = None
-    curve: bpy.types.FCurve
-    for i, curve in enumerate(sorted(curves, key=lambda c: c.array_index)):
+    curves = sorted(curves, key=lambda c: c.array_index)
+    for i, curve in enumerate(curves):
         if curve.array_index != i:
             logger.warning('Unexpected curve channel {} vs. {}.', i, curve.array_index)
             return None
 
-        if num_keyframes is None:
-            num_keyframes = len(curve.keyframe_points)
-        elif num_keyframes != len(curve.keyframe_points):
+    num_keyframes = len(curves[0].keyframe_points)
+    for curve in curves[1:]:
+        if num_keyframes != len(curve.keyframe_points):
             logger.warning(
                 'Not all channels have same number of frames {} vs. {}.', num_keyframes, len(curve.keyframe_points)
             )
             return None
 
-        channels.append(curve.keyframe_points)
-
-    common_interpolation = None
-    key_frames = []
-    for i in range(num_keyframes):
-        value = combine(tuple(frames[i].co[1] for frames in channels))
-        frame_time: float = _all_same(frames[i].co[0] for frames in channels)
-        interpolation: str = _all_same(frames[i].interpolation for frames in channels)
-        if common_interpolation is None:
-            common_interpolation = interpolation
-        elif common_interpolation != interpolation:
-            logger.warning(
-                'Not all frames have same interpolation of frames {} vs. {}.', common_interpolation, interpolation
-            )
-            return None
-        key_frames.append((frame_time, value))
-
-    return common_interpolation, key_frames
+    # Fetch the key frames of all channels in bulk.
+    co = np.empty((num_channels, num_keyframes * 2), dtype=np.float32)
+    interpolations = np.empty((num_channels, num_keyframes), dtype=np.int32)
+    for channel, curve in enumerate(curves):
+        curve.keyframe_points.foreach_get('co', co[channel])
+        curve.keyframe_points.foreach_get('interpolation', interpolations[channel])
+    co = co.reshape(num_channels, num_keyframes, 2)
+
+    times = co[0, :, 0].astype(np.float64)
+    values = co[:, :, 1].T.astype(np.float64)
+    if num_keyframes == 0:
+        return None, times, values
+
+    if (co[1:, :, 0] != co[0, :, 0]).any():
+        logger.warning('Not all channels have their frames at the same times.')
+        return None
 
+    common_interpolation = interpolations[0, 0]
+    mismatch = interpolations != common_interpolation
+    if mismatch.any():
+        logger.warning(
+            'Not all frames have same interpolation of frames {} vs. {}.',
+            keyframe_enum_identifier('interpolation', int(common_interpolation)),
+            keyframe_enum_identifier('interpolation', int(interpolations[mismatch][0])),
+        )
+        return None
 
-def _all_same(values):
-    common = next(values)
-    for value in values:
-        if value != common:
-            raise ValueError('Non common value')
-    return common
+    return keyframe_enum_identifier('interpolation', int(common_interpolation)), times, values
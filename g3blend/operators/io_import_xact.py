@@ -1,8 +1,10 @@
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 import bpy
+import numpy as np
 
 from mathutils import Matrix, Vector
 
@@ -13,14 +15,14 @@ from ..io.animation.xact import eCWrapper_emfx2Actor
 from ..util import (
     bone_correction_matrix,
     bone_correction_matrix_inv,
-    get_child_nodes,
+    group_child_nodes,
+    mesh_from_triangles,
     read_genome_file,
     similar_values_iter,
     to_blend_quat,
     to_blend_vec,
-    to_blend_vec2_tuple,
-    to_blend_vec_tuple,
-    to_blend_vec_tuple_transform,
+    to_blend_vec_array,
+    transform_vec_array,
 )
 
 
@@ -48,9 +50,10 @@ def load_xact(
     show_bone_axes: bool,
     bone_connect: bool,
     bake_transform: bool,
+    use_cache: bool = False,
 ):
     name = actor_name if actor_name else filepath.stem
-    xact = read_genome_file(filepath, Xact)
+    xact = read_genome_file(filepath, Xact, use_mmap=not use_cache, use_cache=use_cache)
 
     # Create and select object for actor
     # TODO: With this approach meshes are not deleted properly (on reimport they get .001 prefix)
@@ -67,7 +70,10 @@ def load_xact(
     armature_obj.parent = actor_obj
     # context.scene.collection.objects.link(armature_obj)
 
-    for mesh_obj in _import_meshes(name, xact.actor, armature_obj, state):
+    with logging.timed(logger, 'Import of meshes of {}', name):
+        mesh_objs = _import_meshes(name, xact.actor, armature_obj, state)
+
+    for mesh_obj in mesh_objs:
         mesh_obj.parent = actor_obj
         context.scene.collection.objects.link(mesh_obj)
 
@@ -80,8 +86,8 @@ def _import_meshes(
 
     meshes = []
     mesh_chunk = actor.get_chunk_by_type(MeshChunk)
-    for submesh in mesh_chunk.submeshes:
-        mesh_name = f'{name}_p{mesh_chunk.submeshes.index(submesh)}'
+    for i, submesh in enumerate(mesh_chunk.submeshes):
+        mesh_name = f'{name}_p{i}'
         mesh = _import_mesh(mesh_name, submesh, state)
         if mesh is None:
             continue
@@ -98,13 +104,12 @@ def _import_mesh(mesh_name: str, submesh: Submesh, state: _ImportState) -> bpy.t
     mesh = bpy.data.meshes.new(mesh_name)
 
     # Vertices and faces
+    vertices = to_blend_vec_array(submesh.positions)
     if state.bake_transform:
-        vertices = [to_blend_vec_tuple_transform(v.position, state.global_matrix) for v in submesh.vertices]
-    else:
-        vertices = [to_blend_vec_tuple(v.position) for v in submesh.vertices]
-    assert len(submesh.indices) % 3 == 0
-    faces = list(zip(*([iter(submesh.indices)] * 3), strict=True))
-    mesh.from_pydata(vertices, [], faces)
+        vertices = transform_vec_array(vertices, state.global_matrix)
+    indices = np.asarray(submesh.indices, dtype=np.int32)
+    assert len(indices) % 3 == 0
+    mesh_from_triangles(mesh, vertices, indices)
     if mesh.validate(verbose=True):
         # Avoid crash
         logger.error('INVALID MESH {}', mesh_name)
@@ -113,9 +118,9 @@ def _import_mesh(mesh_name: str, submesh: Submesh, state: _ImportState) -> bpy.t
     # UVSets
     for uv_set in range(submesh.num_uv_sets):
         uv_layer = mesh.uv_layers.new(name=str(uv_set), do_init=False)
-        assert len(submesh.indices) == len(uv_layer.uv)
-        for i, vert_index in enumerate(submesh.indices):
-            uv_layer.uv[i].vector = to_blend_vec2_tuple(submesh.vertices[vert_index].uv_sets[uv_set])
+        assert len(indices) == len(uv_layer.uv)
+        uvs = np.asarray(submesh.uv_sets[uv_set], dtype=np.float32).reshape(-1, 2)
+        uv_layer.uv.foreach_set('vector', uvs[indices].ravel())
 
     return mesh
 
@@ -131,14 +136,32 @@ def _import_skinning(
     mod: bpy.types.ArmatureModifier = mesh_obj.modifiers.new(armature_obj.name, 'ARMATURE')
     mod.object = armature_obj
     mod.use_vertex_groups = True
-    for vertex_index, vertex in enumerate(submesh.vertices):
-        for influence in skinning.influences[vertex.org_vertex]:
-            node = nodes[influence.node_index]
-            # Vertex group names correspond to bone names
+
+    with logging.timed(logger, 'Skinning of {}', mesh_obj.name):
+        # Collect the weights per node first (the last influence wins, as it would with one REPLACE per influence).
+        node_weights: dict[int, dict[int, float]] = defaultdict(dict)
+        influences = skinning.influences
+        for vertex_index, org_vertex in enumerate(submesh.org_vertices):
+            for influence in influences[org_vertex]:
+                node_weights[influence.node_index][vertex_index] = influence.weight
+
+        # Vertex group names correspond to bone names
+        vertex_groups = {}
+        for node_index in node_weights:
+            node = nodes[node_index]
             vg = mesh_obj.vertex_groups.get(node.name)
             if vg is None:
                 vg = mesh_obj.vertex_groups.new(name=node.name)
-            vg.add((vertex_index,), influence.weight, 'REPLACE')
+            vertex_groups[node_index] = vg
+
+        for node_index, vertex_weights in node_weights.items():
+            vg = vertex_groups[node_index]
+            # Assign all vertices of the same weight with a single call.
+            vertices_per_weight: dict[float, list[int]] = defaultdict(list)
+            for vertex_index, weight in vertex_weights.items():
+                vertices_per_weight[weight].append(vertex_index)
+            for weight, vertex_indices in vertices_per_weight.items():
+                vg.add(vertex_indices, weight, 'REPLACE')
 
 
 def _import_armature(name: str, xact: Xact, state: _ImportState) -> bpy.types.Object:
@@ -160,12 +183,19 @@ def _import_armature(name: str, xact: Xact, state: _ImportState) -> bpy.types.Ob
     state.context.view_layer.objects.active = arm
     bpy.ops.object.mode_set(mode='EDIT')
 
-    # Import root nodes and their children recursively.
+    # Import root nodes and their children, depth-first in the order of the nodes.
     nodes = xact.actor.get_chunks_by_type(NodeChunk)
+    child_nodes = group_child_nodes(nodes)
     arm_base_matrix = state.global_matrix if state.bake_transform else Matrix()
-    for node in nodes:
-        if not node.parent:
-            _import_armature_node(arm_data, arm_base_matrix, Matrix(), None, node, nodes, state)
+    # Iterative instead of recursive traversal, so that deep hierarchies cannot exceed the recursion limit.
+    pending = [(arm_base_matrix, Matrix(), None, node) for node in reversed(child_nodes.get('', []))]
+    while pending:
+        parent_matrix, parent_correction_matrix_inv, parent_bone, node = pending.pop()
+        children = child_nodes.get(node.name, [])
+        bone_matrix, edit_bone = _import_armature_node(
+            arm_data, parent_matrix, parent_correction_matrix_inv, parent_bone, node, children, state
+        )
+        pending.extend((bone_matrix, bone_correction_matrix_inv, edit_bone, child) for child in reversed(children))
 
     # Exit Edit mode
     bpy.ops.object.mode_set(mode='OBJECT')
@@ -203,16 +233,14 @@ def _import_armature_node(
     parent_correction_matrix_inv: Matrix,
     parent_bone: Optional[bpy.types.EditBone],
     node: NodeChunk,
-    nodes: list[NodeChunk],
+    children: list[NodeChunk],
     state: _ImportState,
-):
+) -> tuple[Matrix, Optional[bpy.types.EditBone]]:
     # TODO: Scale...
     # Oh, the problem is that scale is all zeroes, but what is about scale_orient :/
     local_matrix = Matrix.LocRotScale(to_blend_vec(node.position), to_blend_quat(node.rotation), None)
     bone_matrix = parent_matrix @ parent_correction_matrix_inv @ local_matrix
 
-    children = list(get_child_nodes(node, nodes))
-
     bone_size = 0.0
     num_childs = 0
     for child in children:
@@ -253,8 +281,7 @@ def _import_armature_node(
     else:
         edit_bone = parent_bone
 
-    for child in children:
-        _import_armature_node(arm_data, bone_matrix, bone_correction_matrix_inv, edit_bone, child, nodes, state)
+    return bone_matrix, edit_bone
 
 
 # TODO: Attach stuff (slots?) to bone, see link_skeleton_children()...
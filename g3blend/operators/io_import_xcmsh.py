@@ -1,17 +1,25 @@
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 import bpy
+import numpy as np
 
 from mathutils import Matrix
 
 from .. import log as logging
 from ..io.property_sets import eCResourceMeshComplex_PS
-from ..io.property_types import bCVector, bCVector2  # noqa: TC001
 from ..io.structs import eCMeshElement
 from ..io.structs.mesh_element import eEVertexStreamArrayType
-from ..util import read_genome_file, to_blend_vec2_tuple, to_blend_vec_tuple, to_blend_vec_tuple_transform
+from ..util import (
+    mesh_from_triangles,
+    read_genome_file,
+    to_blend_color_array,
+    to_blend_vec_array,
+    transform_normal_array,
+    transform_vec_array,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -32,9 +40,12 @@ def load_xcmsh(
     global_scale: float,
     global_matrix: Matrix,
     bake_transform: bool,
+    use_cache: bool = False,
 ):
     name = mesh_name if mesh_name else filepath.stem
-    mesh_complex = read_genome_file(filepath, eCResourceMeshComplex_PS, allow_fallback=True)
+    mesh_complex = read_genome_file(
+        filepath, eCResourceMeshComplex_PS, allow_fallback=True, use_mmap=not use_cache, use_cache=use_cache
+    )
 
     # Create and select object for actor
     # TODO: With this approach meshes are not deleted properly (on reimport they get .001 prefix)
@@ -60,34 +71,75 @@ def load_xcmsh(
 def _import_mesh(mesh_name: str, mesh_elem: eCMeshElement, state: _ImportState) -> Optional[bpy.types.Mesh]:
     mesh = bpy.data.meshes.new(mesh_name)
 
-    vertices_arr: list[bCVector] = mesh_elem.get_stream_array_by_type(eEVertexStreamArrayType.VertexPosition)
-    if vertices_arr is None:
-        raise ValueError(f"Invalid mesh '{mesh_name}': No vertices array.")
     # Vertices and faces
+    positions = mesh_elem.get_stream_data_by_type(eEVertexStreamArrayType.VertexPosition)
+    if positions is None:
+        raise ValueError(f"Invalid mesh '{mesh_name}': No vertices array.")
+    vertices = to_blend_vec_array(positions)
     if state.bake_transform:
-        vertices = [to_blend_vec_tuple_transform(v, state.global_matrix) for v in vertices_arr]
-    else:
-        vertices = [to_blend_vec_tuple(v) for v in vertices_arr]
+        vertices = transform_vec_array(vertices, state.global_matrix)
 
-    indices_arr: list[int] = mesh_elem.get_stream_array_by_type(eEVertexStreamArrayType.Face)
-    if indices_arr is None:
+    indices = mesh_elem.get_stream_data_by_type(eEVertexStreamArrayType.Face)
+    if indices is None:
         raise ValueError(f"Invalid mesh '{mesh_name}': No face indices array.")
-    if len(indices_arr) % 3 != 0:
+    if len(indices) % 3 != 0:
         raise ValueError(f"Invalid mesh '{mesh_name}': Number of face indices not a multiple of 3.")
+    indices = np.asarray(indices, dtype=np.int32)
 
-    faces = list(zip(*([iter(indices_arr)] * 3), strict=True))
-    mesh.from_pydata(vertices, [], faces)
+    mesh_from_triangles(mesh, vertices, indices)
     if mesh.validate(verbose=True):
         # Avoid crash
         raise ValueError(f"Invalid mesh '{mesh_name}': Validation failed (see log for details).")
 
-    # TODO: Normals?
-
-    # Texture coordinates
-    tex_coords_arr: list[bCVector2] = mesh_elem.get_stream_array_by_type(eEVertexStreamArrayType.TextureCoordinate)
-    if tex_coords_arr:
-        uv_layer = mesh.uv_layers.new(name='uv', do_init=False)
-        for i, vert_index in enumerate(indices_arr):
-            uv_layer.uv[i].vector = to_blend_vec2_tuple(tex_coords_arr[vert_index])
+    for stream_array in mesh_elem.stream_arrays:
+        import_stream = _STREAM_IMPORTERS.get(stream_array.vertex_stream_type)
+        if import_stream is None:
+            continue
+        if stream_array.num_elements() != len(vertices):
+            logger.warning(
+                "Ignoring {} stream of mesh '{}', it does not have one element per vertex.",
+                stream_array.vertex_stream_type.name,
+                mesh_name,
+            )
+            continue
+        import_stream(mesh, stream_array.data, indices, state)
 
     return mesh
+
+
+def _import_normals(mesh: bpy.types.Mesh, normals: Sequence[float], _indices: np.ndarray, state: _ImportState) -> None:
+    normals = to_blend_vec_array(normals)
+    if state.bake_transform:
+        normals = transform_normal_array(normals, state.global_matrix)
+
+    # Custom normals only take effect on smooth shaded faces.
+    mesh.polygons.foreach_set('use_smooth', np.ones(len(mesh.polygons), dtype=bool))
+    if bpy.app.version < (4, 1, 0):
+        # Starting with Blender 4.1 custom normals are always used.
+        mesh.use_auto_smooth = True
+    mesh.normals_split_custom_set_from_vertices(normals)
+
+
+def _import_diffuse(mesh: bpy.types.Mesh, colors: Sequence[int], _indices: np.ndarray, _state: _ImportState) -> None:
+    # D3DCOLOR values are stored as sRGB bytes.
+    color_attribute = mesh.color_attributes.new(name='Diffuse', type='BYTE_COLOR', domain='POINT')
+    color_attribute.data.foreach_set('color_srgb', to_blend_color_array(colors).ravel())
+
+
+def _import_uv_layer(name: str) -> Callable[[bpy.types.Mesh, Sequence[float], np.ndarray, _ImportState], None]:
+    def import_uv_layer(mesh: bpy.types.Mesh, uvs: Sequence[float], indices: np.ndarray, _state: _ImportState) -> None:
+        uv_layer = mesh.uv_layers.new(name=name, do_init=False)
+        # UVs are stored per vertex, but Blender stores them per loop (face corner).
+        uvs = np.asarray(uvs, dtype=np.float32).reshape(-1, 2)
+        uv_layer.uv.foreach_set('vector', uvs[indices].ravel())
+
+    return import_uv_layer
+
+
+# Vertex streams that are imported as mesh attributes (positions and faces are imported separately).
+_STREAM_IMPORTERS = {
+    eEVertexStreamArrayType.Normal: _import_normals,
+    eEVertexStreamArrayType.TextureCoordinate: _import_uv_layer('uv'),
+    eEVertexStreamArrayType.UVLightmapGroups: _import_uv_layer('lightmap'),
+    eEVertexStreamArrayType.Diffuse: _import_diffuse,
+}
@@ -1,22 +1,16 @@
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import astuple, dataclass
 from pathlib import Path
 from typing import Optional
 
 import bpy
+import numpy as np
 
 from mathutils import Matrix
 
 from .. import log as logging
 from ..extension import initialize_g3blend_ext
-from ..io.animation.chunks import (
-    AnimationType,
-    InterpolationType,
-    KeyFrame,
-    KeyFrameChunk,
-    MotionPartChunk,
-    QuaternionKeyFrame,
-    VectorKeyFrame,
-)
+from ..io.animation.chunks import AnimationType, Chunk, InterpolationType, KeyFrameChunk, MotionPartChunk
 from ..io.animation.xmot import ResourceAnimationMotion as Xmot
 from ..util import (
     action_new_fcurve,
@@ -24,9 +18,16 @@ from ..util import (
     bone_correction_matrix_inv,
     calc_arm_root_transformation,
     ceil_safe,
-    read_genome_file,
+    keyframe_enum_value,
+    read_genome_file_header,
+    read_genome_files,
     to_blend_quat,
+    to_blend_quat_array,
     to_blend_vec,
+    to_blend_vec_array,
+    transform_rotation_array,
+    transform_scale_array,
+    transform_translation_array,
     trunc_safe,
 )
 
@@ -81,27 +82,25 @@ def _detect_frame_time(_xmot: Xmot):
     return 25
 
 
-def _group_motion_parts(xmot: Xmot) -> list[tuple[MotionPartChunk, list[KeyFrameChunk]]]:
-    motion_parts = []
+def _group_motion_parts(chunks: Iterable[Chunk]) -> Iterator[tuple[MotionPartChunk, list[KeyFrameChunk]]]:
     cur_motion_part = None
     cur_key_frames = []
 
-    def push_motion_part():
-        if cur_motion_part is not None:
-            motion_parts.append((cur_motion_part, cur_key_frames))
-        elif cur_key_frames:
-            raise ValueError('KeyFrame chunk must be preceded by a MotionPart chunk.')
-
-    for chunk in xmot.motion.chunks:
+    for chunk in chunks:
         if isinstance(chunk, MotionPartChunk):
-            push_motion_part()
+            if cur_motion_part is not None:
+                yield cur_motion_part, cur_key_frames
+            elif cur_key_frames:
+                raise ValueError('KeyFrame chunk must be preceded by a MotionPart chunk.')
             cur_motion_part = chunk
             cur_key_frames = []
         elif isinstance(chunk, KeyFrameChunk):
             cur_key_frames.append(chunk)
 
-    push_motion_part()
-    return motion_parts
+    if cur_motion_part is not None:
+        yield cur_motion_part, cur_key_frames
+    elif cur_key_frames:
+        raise ValueError('KeyFrame chunk must be preceded by a MotionPart chunk.')
 
 
 def _import_motion_part(
@@ -144,38 +143,33 @@ def _import_motion_part(
 def _import_key_frames(
     animation_type: AnimationType,
     interpolation_type: InterpolationType,
-    frames: list[KeyFrame],
+    times: np.ndarray,
+    values: np.ndarray,
     pose_bone: bpy.types.PoseBone,
     pre_matrix: Matrix,
     post_matrix: Matrix,
     state: _ImportState,
     synthesized: bool,
 ):
-    def position_value_extract(v):
-        return (pre_matrix @ Matrix.Translation(to_blend_vec(v) * state.root_scale) @ post_matrix).to_translation()
-
-    def rotation_value_extract(v):
-        return (pre_matrix @ to_blend_quat(v).to_matrix().to_4x4() @ post_matrix).to_quaternion()
-
-    def scaling_value_extract(v):
-        return (pre_matrix @ Matrix.LocRotScale(None, None, to_blend_vec(v)) @ post_matrix).to_scale().to_3d()
+    """
+    Import the key frames of one animation type of a motion part.
 
+    `times` holds the time of each key frame, and `values` the flat values as stored in the xmot.
+    """
     match animation_type:
         # Position
         case AnimationType.Position:
             curve_path = 'location'
-            value_extract = position_value_extract
-            num_channels = 3
+            positions = to_blend_vec_array(values) * np.asarray(state.root_scale)
+            channel_values = transform_translation_array(pre_matrix, positions, post_matrix)
         # Rotation
         case AnimationType.Rotation:
             curve_path = 'rotation_quaternion'
-            value_extract = rotation_value_extract
-            num_channels = 4
+            channel_values = transform_rotation_array(pre_matrix, to_blend_quat_array(values), post_matrix)
         # Scaling
         case AnimationType.Scaling:
             curve_path = 'scale'
-            value_extract = scaling_value_extract
-            num_channels = 3
+            channel_values = transform_scale_array(pre_matrix, to_blend_vec_array(values), post_matrix)
         case _:
             raise ValueError(f'Unsupported animation type: {animation_type}')
 
@@ -189,35 +183,33 @@ def _import_key_frames(
         case _:
             raise ValueError(f'Unsupported interpolation type: {interpolation_type}')
 
-    prop = pose_bone.path_from_id(curve_path)
-    curves = [
-        action_new_fcurve(state.action, state.action_slot, prop, index=channel, group_name=pose_bone.name)
-        for channel in range(num_channels)
-    ]
-
-    # TODO: Cycle vs. Extrapolation
-    # Pre-allocate all keyframes
-    for channel in range(num_channels):
-        curves[channel].keyframe_points.add(len(frames))
+    num_frames = len(times)
+    interpolations = np.full(num_frames, keyframe_enum_value('interpolation', interpolation), dtype=np.int32)
+    # Just a visual highlight for synthesized frames, has no functional implication.
+    key_types = np.full(num_frames, keyframe_enum_value('type', 'JITTER'), dtype=np.int32) if synthesized else None
 
     # TODO: Proper time/FPS scaling
-    for i, frame in enumerate(frames):
-        value = value_extract(frame.value)
-
-        for channel in range(num_channels):
-            keyframe_point = curves[channel].keyframe_points[i]
-            keyframe_point.co = frame.time * state.fps, value[channel]
-            keyframe_point.interpolation = interpolation
-            if synthesized:
-                # Just a visual highlight for synthesized frames, has no functional implication.
-                keyframe_point.type = 'JITTER'
+    co = np.empty((num_frames, 2), dtype=np.float32)
+    co[:, 0] = times * state.fps
 
-        state.update_frame_time(frame.time)
-
-    # Usage of low level API to insert key frames requires manual update afterwards.
-    for curve in curves:
+    prop = pose_bone.path_from_id(curve_path)
+    # TODO: Cycle vs. Extrapolation
+    for channel in range(channel_values.shape[1]):
+        curve = action_new_fcurve(state.action, state.action_slot, prop, index=channel, group_name=pose_bone.name)
+        keyframe_points = curve.keyframe_points
+        keyframe_points.add(num_frames)
+        co[:, 1] = channel_values[:, channel]
+        keyframe_points.foreach_set('co', co.ravel())
+        keyframe_points.foreach_set('interpolation', interpolations)
+        if key_types is not None:
+            keyframe_points.foreach_set('type', key_types)
+        # Usage of low level API to insert key frames requires manual update afterwards.
         curve.update()
 
+    if num_frames > 0:
+        state.update_frame_time(times.min())
+        state.update_frame_time(times.max())
+
 
 def load_xmot(
     context: bpy.types.Context,
@@ -227,12 +219,53 @@ def load_xmot(
     global_matrix: Matrix,
     ignore_transform: bool,
 ):
-    name = filepath.stem
-    xmot = read_genome_file(filepath, Xmot)
+    # Motion parts are imported while the chunks are decoded, instead of reading all chunks up front.
+    xmot = Xmot()
+    motion_chunks = xmot.read_streamed(read_genome_file_header(filepath, use_mmap=True))
 
     if arm_obj is None:
         raise ValueError('No target armature was selected.')
 
+    _import_xmot(context, filepath.stem, xmot, motion_chunks, arm_obj, global_scale, global_matrix, ignore_transform)
+
+
+def load_xmots(
+    context: bpy.types.Context,
+    filepaths: list[Path],
+    arm_obj: bpy.types.Object,
+    global_scale: float,
+    global_matrix: Matrix,
+    ignore_transform: bool,
+    parallel: bool,
+):
+    """
+    Import multiple xmot files.
+
+    The files are parsed up front (in parallel worker processes if `parallel` is set), only the creation of the
+    actions happens afterward in the main thread.
+    """
+    if arm_obj is None:
+        raise ValueError('No target armature was selected.')
+
+    with logging.timed(logger, 'Parsing of {} motions', len(filepaths)):
+        xmots = read_genome_files(filepaths, Xmot, parallel=parallel)
+
+    for filepath, xmot in zip(filepaths, xmots, strict=True):
+        _import_xmot(
+            context, filepath.stem, xmot, xmot.motion.chunks, arm_obj, global_scale, global_matrix, ignore_transform
+        )
+
+
+def _import_xmot(
+    context: bpy.types.Context,
+    name: str,
+    xmot: Xmot,
+    motion_chunks: Iterable[Chunk],
+    arm_obj: bpy.types.Object,
+    global_scale: float,
+    global_matrix: Matrix,
+    ignore_transform: bool,
+):
     fps = _detect_frame_time(xmot)
 
     action = bpy.data.actions.new(name)
@@ -243,6 +276,8 @@ def load_xmot(
     if not arm_obj.animation_data:
         arm_obj.animation_data_create()
 
+    previous_action = arm_obj.animation_data.action
+    previous_action_slot = getattr(arm_obj.animation_data, 'action_slot', None)
     arm_obj.animation_data.action = action
     action_slot = None
     # Support for Slotted Actions as introduced in Blender 4.4
@@ -265,7 +300,25 @@ def load_xmot(
 
     state = _ImportState(arm_obj, action, action_slot, fps, root_scale, root_matrix_no_scale)
 
-    for motion_part, key_frames in _group_motion_parts(xmot):
+    try:
+        _import_motion_parts(motion_chunks, arm_obj, state)
+    except BaseException:
+        # The chunks may be decoded while they are imported, so a broken file is only detected midway. Remove the
+        # half-filled action again, and restore the previous one.
+        arm_obj.animation_data.action = previous_action
+        if previous_action_slot is not None:
+            arm_obj.animation_data.action_slot = previous_action_slot
+        bpy.data.actions.remove(action)
+        raise
+
+    if state.min_frame_time is not None:
+        context.scene.frame_start = trunc_safe(state.min_frame_time * fps)
+        context.scene.frame_end = ceil_safe(state.max_frame_time * fps)
+        context.scene.frame_current = 0
+
+
+def _import_motion_parts(motion_chunks: Iterable[Chunk], arm_obj: bpy.types.Object, state: _ImportState):
+    for motion_part, key_frames in _group_motion_parts(motion_chunks):
         if motion_part.name not in arm_obj.pose.bones:
             logger.warning('Unknown MotionPart, skipping motion: {}', motion_part.name)
             continue
@@ -276,7 +329,8 @@ def load_xmot(
             _import_key_frames(
                 key_frame_chunk.animation_type,
                 key_frame_chunk.interpolation_type,
-                key_frame_chunk.frames,
+                np.asarray(key_frame_chunk.times, dtype=np.float64),
+                np.asarray(key_frame_chunk.values, dtype=np.float64),
                 pose_bone,
                 pre_matrix,
                 post_matrix,
@@ -291,7 +345,8 @@ def load_xmot(
             _import_key_frames(
                 AnimationType.Position,
                 InterpolationType.Linear,
-                [VectorKeyFrame(0.0, motion_part.pose_position)],
+                np.zeros(1),
+                np.array(astuple(motion_part.pose_position)),
                 pose_bone,
                 pre_matrix,
                 post_matrix,
@@ -303,15 +358,11 @@ def load_xmot(
             _import_key_frames(
                 AnimationType.Rotation,
                 InterpolationType.Linear,
-                [QuaternionKeyFrame(0.0, motion_part.pose_rotation)],
+                np.zeros(1),
+                np.array(astuple(motion_part.pose_rotation)),
                 pose_bone,
                 pre_matrix,
                 post_matrix,
                 state,
                 synthesized=True,
             )
-
-    if state.min_frame_time is not None:
-        context.scene.frame_start = trunc_safe(state.min_frame_time * fps)
-        context.scene.frame_end = ceil_safe(state.max_frame_time * fps)
-        context.scene.frame_current = 0
@@ -60,6 +60,13 @@ class ImportXact(bpy.types.Operator, ImportHelper, AxisHelper):
         default=True,
     )
 
+    use_cache: BoolProperty(
+        name='Use Parse Cache',
+        description='Keep the parsed file in a cache (in memory and in the temp directory), to speed up importing it '
+        'again. Otherwise the file is memory-mapped, which needs less memory',
+        default=False,
+    )
+
     def draw(self, _context):
         pass
 
@@ -78,6 +85,7 @@ class ImportXact(bpy.types.Operator, ImportHelper, AxisHelper):
                 self.show_bone_axes,
                 self.bone_connect,
                 self.bake_transform,
+                self.use_cache,
             )
             # Reset actor name override on successful import.
             self.actor_name = ''
@@ -115,6 +123,7 @@ class G3BLEND_PT_import_xact_misc(AbstractFilePanel):
     def _draw(self, _context: bpy.types.Context, layout: bpy.types.UILayout, operator: bpy.types.Operator):
         layout.prop(operator, 'reset_scene')
         layout.prop(operator, 'actor_name')
+        layout.prop(operator, 'use_cache')
 
 
 classes = (ImportXact, G3BLEND_PT_import_xact_transform, G3BLEND_PT_import_xact_armature, G3BLEND_PT_import_xact_misc)
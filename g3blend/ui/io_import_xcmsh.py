@@ -40,6 +40,13 @@ class ImportXcmsh(bpy.types.Operator, ImportHelper, AxisHelper):
         default=True,
     )
 
+    use_cache: BoolProperty(
+        name='Use Parse Cache',
+        description='Keep the parsed file in a cache (in memory and in the temp directory), to speed up importing it '
+        'again. Otherwise the file is memory-mapped, which needs less memory',
+        default=False,
+    )
+
     def draw(self, context):
         pass
 
@@ -48,7 +55,15 @@ class ImportXcmsh(bpy.types.Operator, ImportHelper, AxisHelper):
             global_scale, global_matrix = self._global_transform(context)
             if self.reset_scene:
                 reset_scene()
-            load_xcmsh(context, Path(self.filepath), self.mesh_name, global_scale, global_matrix, self.bake_transform)
+            load_xcmsh(
+                context,
+                Path(self.filepath),
+                self.mesh_name,
+                global_scale,
+                global_matrix,
+                self.bake_transform,
+                self.use_cache,
+            )
             # Reset mesh name override on successful import.
             self.mesh_name = ''
         except Exception as e:
@@ -74,6 +89,7 @@ class G3BLEND_PT_import_xcmsh_misc(AbstractFilePanel):
     def _draw(self, _context: bpy.types.Context, layout: bpy.types.UILayout, operator: bpy.types.Operator):
         layout.prop(operator, 'reset_scene')
         layout.prop(operator, 'mesh_name')
+        layout.prop(operator, 'use_cache')
 
 
 classes = (ImportXcmsh, G3BLEND_PT_import_xcmsh_transform, G3BLEND_PT_import_xcmsh_misc)
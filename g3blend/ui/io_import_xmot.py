@@ -6,7 +6,7 @@ from bpy.props import BoolProperty, CollectionProperty, EnumProperty, IntPropert
 from bpy_extras.io_utils import ImportHelper
 
 from .. import log as logging
-from ..operators.io_import_xmot import load_xmot
+from ..operators.io_import_xmot import load_xmot, load_xmots
 from ..util import hidden_property_options
 from .helper import (
     AbstractFilePanel,
@@ -40,6 +40,12 @@ class ImportXmot(bpy.types.Operator, ImportHelper, AxisHelper):
         name='Ignore Transform', description='Ignore transform set on the armature object', default=False
     )
 
+    parallel: BoolProperty(
+        name='Parallel Parsing',
+        description='When importing multiple files, parse them in parallel worker processes',
+        default=True,
+    )
+
     target_armature_index: IntProperty()
 
     def _set_target_armature(self, item):
@@ -64,14 +70,24 @@ class ImportXmot(bpy.types.Operator, ImportHelper, AxisHelper):
             global_scale, global_matrix = self._global_transform(context)
             target_armature = get_object_for_armature_item(context, self.target_armature)
 
-            if self.files:
-                directory = Path(self.directory)
-                for f in self.files:
-                    filepath = directory / f.name
-                    load_xmot(context, filepath, target_armature, global_scale, global_matrix, self.ignore_transform)
+            directory = Path(self.directory)
+            filepaths = [directory / f.name for f in self.files if f.name]
+            if not filepaths:
+                # No file selected, import all files in the directory.
+                filepath = Path(self.filepath)
+                filepaths = sorted(filepath.glob('*.xmot')) if filepath.is_dir() else [filepath]
+
+            if len(filepaths) == 1:
+                load_xmot(context, filepaths[0], target_armature, global_scale, global_matrix, self.ignore_transform)
             else:
-                load_xmot(
-                    context, Path(self.filepath), target_armature, global_scale, global_matrix, self.ignore_transform
+                load_xmots(
+                    context,
+                    filepaths,
+                    target_armature,
+                    global_scale,
+                    global_matrix,
+                    self.ignore_transform,
+                    self.parallel,
                 )
 
             self.target_armature_index = 0
@@ -89,6 +105,7 @@ class G3BLEND_PT_import_xmot_import(AbstractFilePanel):
 
     def _draw(self, _context: bpy.types.Context, layout: bpy.types.UILayout, operator: bpy.types.Operator):
         layout.prop(operator, 'target_armature')
+        layout.prop(operator, 'parallel')
 
 
 class G3BLEND_PT_import_xmot_transform(AbstractFileTransformPanel):
@@ -1,19 +1,23 @@
 import math
+import os
+import shutil
+import tempfile
 
+from collections import defaultdict
 from collections.abc import Iterable
 from pathlib import Path
 from typing import Optional, TypeVar
 
 import bpy
+import numpy as np
 
 from bpy.types import Action, FCurve
 from bpy_extras.io_utils import axis_conversion
 from mathutils import Matrix, Quaternion, Vector
 
-from .io import genome_file
-from .io.binary import BinaryReader, BinaryWriter, TBinarySerializable
+from .io import cache, genome_file
+from .io.binary import BinaryReader, StreamBinaryWriter, TBinarySerializable
 from .io.property_types.vector import bCVector
-from .io.property_types.vector2 import bCVector2
 from .io.types.quaternion import bCQuaternion
 
 
@@ -21,15 +25,69 @@ T = TypeVar('T')
 
 
 def read_genome_file(
-    file: Path, content_type: type[TBinarySerializable], allow_fallback: bool = False
+    file: Path,
+    content_type: type[TBinarySerializable],
+    allow_fallback: bool = False,
+    use_mmap: bool = False,
+    lazy: bool = False,
+    use_cache: bool = False,
 ) -> TBinarySerializable:
-    return genome_file.read(BinaryReader(Path(file)), content_type, allow_fallback)
+    """
+    Read a Genome file.
+
+    If `use_cache` is set, the parsed content is looked up in and stored into the parse cache. Cached contents are
+    always read without memory mapping and without lazy decoding, so `use_mmap` and `lazy` are ignored then.
+    """
+    if use_cache:
+        return cache.default_cache.read(Path(file), content_type, allow_fallback)
+    return genome_file.read(BinaryReader(Path(file), use_mmap, lazy), content_type, allow_fallback)
+
+
+def read_genome_files(
+    files: Iterable[Path], content_type: type[TBinarySerializable], allow_fallback: bool = False, parallel: bool = True
+) -> list[TBinarySerializable]:
+    """Read multiple Genome files, in parallel worker processes if `parallel` is set."""
+    return genome_file.read_files(files, content_type, allow_fallback, max_workers=None if parallel else 1)
+
+
+def read_genome_file_header(file: Path, allow_fallback: bool = False, use_mmap: bool = False) -> BinaryReader:
+    """Open a Genome file, and return a reader positioned at the start of its content."""
+    reader = BinaryReader(Path(file), use_mmap)
+    genome_file.read_header(reader, allow_fallback)
+    return reader
 
 
 def write_genome_file(file: Path, content: TBinarySerializable) -> None:
-    writer = BinaryWriter()
-    genome_file.write(writer, content)
-    file.write_bytes(writer.buf())
+    """
+    Write a Genome file, the output is streamed to the file instead of being assembled in memory first.
+
+    The output goes to a temporary file next to `file`, which only replaces `file` once it is complete. So if the
+    serialization fails, an existing file is left untouched.
+    """
+    file = Path(file)
+    fd, tmp_name = tempfile.mkstemp(dir=file.parent, prefix=f'.{file.name}.', suffix='.tmp')
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer = StreamBinaryWriter(f)
+            genome_file.write(writer, content)
+            writer.flush()
+        _copy_file_mode(file, tmp_path)
+        tmp_path.replace(file)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _copy_file_mode(file: Path, tmp_path: Path) -> None:
+    """Give the temporary file the mode of the file it replaces, or the default mode of a new file."""
+    if file.exists():
+        shutil.copymode(file, tmp_path)
+    else:
+        # The umask can only be read by setting it.
+        umask = os.umask(0)
+        os.umask(umask)
+        tmp_path.chmod(0o666 & ~umask)
 
 
 def to_blend_quat(quat: bCQuaternion) -> Quaternion:
@@ -40,18 +98,163 @@ def to_blend_vec(vector: bCVector) -> Vector:
     return Vector((vector.x, vector.z, vector.y))
 
 
-def to_blend_vec_tuple(vector: bCVector) -> tuple[float, float, float]:
-    return vector.x, vector.z, vector.y
-
-
-def to_blend_vec_tuple_transform(vector: bCVector, transform: Matrix) -> tuple[float, float, float]:
-    vec = to_blend_vec(vector)
-    vec = transform @ vec
-    return vec.x, vec.y, vec.z
-
-
-def to_blend_vec2_tuple(vector: bCVector2) -> tuple[float, float]:
-    return vector.x, vector.y
+def to_blend_vec_array(vectors) -> np.ndarray:
+    """Convert a flat buffer of vectors (x, y, z, x, y, z, ...) into an (N, 3) array of Blender vectors."""
+    return np.asarray(vectors, dtype=np.float32).reshape(-1, 3)[:, (0, 2, 1)]
+
+
+def transform_vec_array(vectors: np.ndarray, transform: Matrix) -> np.ndarray:
+    matrix = np.array(transform, dtype=np.float32)
+    return vectors @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def transform_normal_array(normals: np.ndarray, transform: Matrix) -> np.ndarray:
+    """Transform (N, 3) normals by the inverse transpose of the linear part of the transform, and renormalize them."""
+    normals = normals @ np.linalg.inv(np.array(transform.to_3x3(), dtype=np.float64))
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return (normals / np.where(lengths > 0, lengths, 1)).astype(np.float32)
+
+
+def to_blend_color_array(colors) -> np.ndarray:
+    """Convert a buffer of D3DCOLOR values (0xAARRGGBB) into an (N, 4) array of RGBA colors in the range [0, 1]."""
+    colors = np.asarray(colors, dtype=np.uint32)
+    channels = np.stack((colors >> 16, colors >> 8, colors, colors >> 24), axis=1) & 0xFF
+    return channels.astype(np.float32) / 255
+
+
+def to_blend_quat_array(quats) -> np.ndarray:
+    """Convert a flat buffer of quaternions (x, y, z, w, ...) into an (N, 4) array of Blender quaternions."""
+    quats = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+    return np.stack((-quats[:, 3], quats[:, 0], quats[:, 2], quats[:, 1]), axis=1)
+
+
+def quat_array_to_matrix(quats: np.ndarray) -> np.ndarray:
+    """Batched Quaternion.to_matrix(), converts (N, 4) quaternions (w, x, y, z) into (N, 3, 3) matrices."""
+    w, x, y, z = quats.T
+    matrices = np.empty((len(quats), 3, 3))
+    matrices[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    matrices[:, 0, 1] = 2 * (x * y - w * z)
+    matrices[:, 0, 2] = 2 * (x * z + w * y)
+    matrices[:, 1, 0] = 2 * (x * y + w * z)
+    matrices[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    matrices[:, 1, 2] = 2 * (y * z - w * x)
+    matrices[:, 2, 0] = 2 * (x * z - w * y)
+    matrices[:, 2, 1] = 2 * (y * z + w * x)
+    matrices[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return matrices
+
+
+def matrix_array_to_quat(matrices: np.ndarray) -> np.ndarray:
+    """
+    Batched Matrix.to_quaternion(), converts (N, 3, 3) matrices into (N, 4) quaternions (w, x, y, z).
+
+    Like mathutils, the columns of the matrices are normalized first, and the quaternions are canonical (w >= 0).
+    """
+    norms = np.linalg.norm(matrices, axis=1, keepdims=True)
+    m = matrices / np.where(norms == 0.0, 1.0, norms)
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+
+    # Pick the numerically most stable branch per matrix.
+    trace = m00 + m11 + m22
+    use_w = trace > 0.0
+    use_x = ~use_w & (m00 > m11) & (m00 > m22)
+    use_y = ~use_w & ~use_x & (m11 > m22)
+    use_z = ~use_w & ~use_x & ~use_y
+
+    quats = np.empty((len(m), 4))
+    i = use_w
+    s = 2.0 * np.sqrt(1.0 + trace[i])
+    quats[i, 0] = s / 4
+    quats[i, 1] = (m21[i] - m12[i]) / s
+    quats[i, 2] = (m02[i] - m20[i]) / s
+    quats[i, 3] = (m10[i] - m01[i]) / s
+    i = use_x
+    s = 2.0 * np.sqrt(1.0 + m00[i] - m11[i] - m22[i])
+    quats[i, 0] = (m21[i] - m12[i]) / s
+    quats[i, 1] = s / 4
+    quats[i, 2] = (m01[i] + m10[i]) / s
+    quats[i, 3] = (m02[i] + m20[i]) / s
+    i = use_y
+    s = 2.0 * np.sqrt(1.0 + m11[i] - m00[i] - m22[i])
+    quats[i, 0] = (m02[i] - m20[i]) / s
+    quats[i, 1] = (m01[i] + m10[i]) / s
+    quats[i, 2] = s / 4
+    quats[i, 3] = (m12[i] + m21[i]) / s
+    i = use_z
+    s = 2.0 * np.sqrt(np.maximum(1.0 + m22[i] - m00[i] - m11[i], 0.0))
+    quats[i, 0] = (m10[i] - m01[i]) / s
+    quats[i, 1] = (m02[i] + m20[i]) / s
+    quats[i, 2] = (m12[i] + m21[i]) / s
+    quats[i, 3] = s / 4
+
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    quats[quats[:, 0] < 0.0] *= -1.0
+    return quats
+
+
+def from_blend_vec_array(vectors: np.ndarray) -> np.ndarray:
+    """Convert an (N, 3) array of Blender vectors into an (N, 3) array of Genome vectors."""
+    return vectors[:, (0, 2, 1)]
+
+
+def from_blend_quat_array(quats: np.ndarray) -> np.ndarray:
+    """Convert an (N, 4) array of Blender quaternions into an (N, 4) array of Genome quaternions (x, y, z, w)."""
+    return np.stack((quats[:, 1], quats[:, 3], quats[:, 2], -quats[:, 0]), axis=1)
+
+
+def transform_translation_array(pre_matrix: Matrix, translations: np.ndarray, post_matrix: Matrix) -> np.ndarray:
+    """Batched (pre_matrix @ Matrix.Translation(translation) @ post_matrix).to_translation()."""
+    pre = np.array(pre_matrix)
+    post = np.array(post_matrix)
+    return (translations + post[:3, 3]) @ pre[:3, :3].T + pre[:3, 3]
+
+
+def transform_rotation_array(pre_matrix: Matrix, quats: np.ndarray, post_matrix: Matrix) -> np.ndarray:
+    """Batched (pre_matrix @ quat.to_matrix().to_4x4() @ post_matrix).to_quaternion()."""
+    pre = np.array(pre_matrix)
+    post = np.array(post_matrix)
+    return matrix_array_to_quat(pre[:3, :3] @ quat_array_to_matrix(quats) @ post[:3, :3])
+
+
+def transform_scale_array(pre_matrix: Matrix, scales: np.ndarray, post_matrix: Matrix) -> np.ndarray:
+    """Batched (pre_matrix @ Matrix.LocRotScale(None, None, scale) @ post_matrix).to_scale()."""
+    pre = np.array(pre_matrix)
+    post = np.array(post_matrix)
+    return np.linalg.norm(pre[:3, :3] @ (scales[:, :, None] * post[:3, :3]), axis=1)
+
+
+def keyframe_enum_value(prop: str, identifier: str) -> int:
+    """Value of an enum item of a Keyframe property, as used by keyframe_points.foreach_get/foreach_set."""
+    return bpy.types.Keyframe.bl_rna.properties[prop].enum_items[identifier].value
+
+
+def keyframe_enum_identifier(prop: str, value: int) -> str:
+    """Inverse of keyframe_enum_value()."""
+    for item in bpy.types.Keyframe.bl_rna.properties[prop].enum_items:
+        if item.value == value:
+            return item.identifier
+    raise ValueError(f'Unknown value {value} for keyframe property {prop}.')
+
+
+def mesh_from_triangles(mesh: bpy.types.Mesh, vertices: np.ndarray, indices: np.ndarray) -> None:
+    """Bulk equivalent of mesh.from_pydata(vertices, [], faces) for a triangle list, using foreach_set."""
+    num_loops = len(indices)
+    num_faces = num_loops // 3
+
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+    mesh.loops.add(num_loops)
+    mesh.loops.foreach_set('vertex_index', np.asarray(indices, dtype=np.int32))
+    mesh.polygons.add(num_faces)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, num_loops, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Starting with Blender 4.0 loop_total is derived from loop_start.
+        mesh.polygons.foreach_set('loop_total', np.full(num_faces, 3, dtype=np.int32))
+    # Same as from_pydata, which shades flat.
+    mesh.polygons.foreach_set('use_smooth', np.zeros(num_faces, dtype=bool))
+    mesh.update(calc_edges=True)
 
 
 def _from_blend_quat(quat: Quaternion) -> bCQuaternion:
@@ -62,8 +265,12 @@ def _from_blend_vec(vector: Vector) -> bCVector:
     return bCVector(vector.x, vector.z, vector.y)
 
 
-def get_child_nodes(node: T, nodes: list[T]) -> Iterable[T]:
-    return (child for child in nodes if child.parent == node.name)
+def group_child_nodes(nodes: Iterable[T]) -> dict[str, list[T]]:
+    """Map the name of each parent to its children (in order), root nodes are grouped under an empty name."""
+    child_nodes = defaultdict(list)
+    for node in nodes:
+        child_nodes[node.parent].append(node)
+    return dict(child_nodes)
 
 
 def similar_values_iter(v1, v2, epsilon=1e-4):
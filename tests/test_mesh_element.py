@@ -0,0 +1,84 @@
+import array
+import unittest
+
+from benchmarks import synthetic
+
+from g3blend.io import genome_file
+from g3blend.io.binary import BinaryReader, BinaryWriter
+from g3blend.io.property_sets import eCResourceMeshComplex_PS
+from g3blend.io.property_types import bCVector, bCVector2
+from g3blend.io.structs.mesh_element import create_vertex_struct_array, eEVertexStreamArrayType
+
+
+def _round_trip(stream_array):
+    writer = BinaryWriter()
+    stream_array.write(writer)
+    result = create_vertex_struct_array(stream_array.vertex_stream_type)
+    result.read(BinaryReader(bytes(writer.buf())))
+    return result
+
+
+class VertexStructArrayElementsTest(unittest.TestCase):
+    def test_new_array_has_no_elements(self):
+        for stream_type in (
+            eEVertexStreamArrayType.Face,
+            eEVertexStreamArrayType.VertexPosition,
+            eEVertexStreamArrayType.TextureCoordinate,
+        ):
+            stream_array = create_vertex_struct_array(stream_type)
+            assert list(stream_array.elements) == []
+            assert stream_array.num_elements() == 0
+
+    def test_set_and_get_elements(self):
+        positions = [bCVector(1.0, 2.0, 3.0), bCVector(4.0, 5.0, 6.0)]
+        stream_array = create_vertex_struct_array(eEVertexStreamArrayType.VertexPosition)
+        stream_array.elements = positions
+        assert stream_array.elements == positions
+        assert stream_array.num_elements() == 2
+        assert _round_trip(stream_array).elements == positions
+
+    def test_get_elements_from_list_data(self):
+        stream_array = create_vertex_struct_array(eEVertexStreamArrayType.TextureCoordinate)
+        stream_array.data = [0.5, 0.25, 1.0, 0.0]
+        assert stream_array.elements == [bCVector2(0.5, 0.25), bCVector2(1.0, 0.0)]
+
+    def test_single_component_elements(self):
+        stream_array = create_vertex_struct_array(eEVertexStreamArrayType.Face)
+        stream_array.elements = [0, 1, 2]
+        assert stream_array.data == array.array('I', [0, 1, 2])
+        assert list(_round_trip(stream_array).elements) == [0, 1, 2]
+
+
+class VertexStructArrayEqualityTest(unittest.TestCase):
+    def test_equal_after_reading_twice(self):
+        stream_array = create_vertex_struct_array(eEVertexStreamArrayType.Normal)
+        stream_array.elements = [bCVector(1.0, 0.0, 0.0), bCVector(0.0, 1.0, 0.0)]
+        assert _round_trip(stream_array) == _round_trip(stream_array)
+        assert _round_trip(stream_array) == stream_array
+
+    def test_not_equal(self):
+        stream_array = create_vertex_struct_array(eEVertexStreamArrayType.TextureCoordinate)
+        stream_array.elements = [bCVector2(0.5, 0.25)]
+        other = _round_trip(stream_array)
+        other.elements = [bCVector2(0.5, 0.5)]
+        assert stream_array != other
+        other.elements = [bCVector2(0.5, 0.25), bCVector2(0.5, 0.25)]
+        assert stream_array != other
+        assert stream_array != create_vertex_struct_array(eEVertexStreamArrayType.Unk_68)
+
+    def test_equal_list_and_array_data(self):
+        stream_array = create_vertex_struct_array(eEVertexStreamArrayType.Face)
+        stream_array.data = [0, 1, 2]
+        other = create_vertex_struct_array(eEVertexStreamArrayType.Face)
+        other.elements = [0, 1, 2]
+        assert stream_array == other
+
+    def test_mesh_complex_equal_after_reading_twice(self):
+        data = synthetic.to_bytes(synthetic.make_mesh_complex(2, 10))
+        first = genome_file.read(BinaryReader(data), eCResourceMeshComplex_PS)
+        second = genome_file.read(BinaryReader(data), eCResourceMeshComplex_PS)
+        assert first == second
+
+
+if __name__ == '__main__':
+    unittest.main()